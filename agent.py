@@ -1,19 +1,57 @@
 import os
 import json
 import re
+import asyncio
+import orjson
+import functools
+import hashlib
+import itertools
+import logging
+import logging.handlers
+import queue
+import threading
+import time
 from typing import TypedDict, Literal, Optional
 from datetime import datetime, date
 from dotenv import load_dotenv
 
 from langgraph.graph import StateGraph, END
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from diskcache import Cache
+
 from tools import search_web, get_search_urls
-from searcher import scrape_with_god_mode, scrape_multiple_with_god_mode
-import dateutil.parser
+from searcher import run_crawler, run_crawler_parallel, clear_scrape_cache
+
+# Skip the .env file read if the keys are already in the environment
+if not (os.getenv("VERTEX_API_KEY") or os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")):
+    load_dotenv()
+
+
+# uvloop (libuv) event loop: measurably lower loop overhead for the
+# IO-heavy fan-out the nodes do (scrapes + Gemini + Supabase in flight
+# at once). Optional — silently fall back to the stdlib loop.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 
-load_dotenv()
+
+# Non-blocking logging: nodes enqueue records and a background listener
+# does the actual stdout IO, so concurrent case workers never serialize
+# on the stdout lock/flush.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+
+logger = logging.getLogger("agent")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
 
 
 
@@ -24,7 +62,8 @@ class AgentState(TypedDict):
     Attributes:
         case_name: The name of the legal case to research.
         search_attempts: Number of search attempts made (for retry logic).
-        scraped_data: Accumulated scraped content from web searches.
+        scraped_data: Accumulated scraped content chunks, one per attempt
+            (joined once at analyze time to avoid quadratic string growth).
         final_verdict: The extracted case information (dict with hearing date, status, names).
         search_results: Raw search results from the last search.
         error_message: Any error message encountered during processing.
@@ -32,18 +71,182 @@ class AgentState(TypedDict):
     case_name: str
     docket_url: Optional[str]
     search_attempts: int
-    scraped_data: str
+    scraped_data: list
     final_verdict: dict
     search_results: str
     error_message: str
     case_id: Optional[int]
+    prefetch_search: Optional[dict]
+    docket_satisfied: bool
+    seen_urls: list
+    today: date
+    speculative_task: Optional[object]
+
+
+
+ANALYZE_SYSTEM_PROMPT = """You are a legal research assistant. Analyze the provided text regarding the named legal case.
+
+    Your Goal: Extract the timeline of the case.
+
+    1. **Next Hearing Date:** Find any scheduled court date happening AFTER the current date given by the user.
+       - If none, return "Unknown".
+    2. **Last Hearing Date:** Find the most recent court date that happened BEFORE the current date given by the user.
+       - If the case is Closed, this is the date it was closed/verdict read.
+    3. **Status:** "Open", "Closed", or "Verdict Reached".
+
+    Return STRICT JSON format:
+    {
+        "next_hearing_date": "YYYY-MM-DD" or "Unknown",
+        "last_hearing_date": "YYYY-MM-DD" or "Unknown",
+        "case_status": "Open/Closed/Verdict Reached",
+        "victim_name": "Name or Unknown",
+        "suspect_name": "Name or Unknown",
+        "confidence": "high/medium/low",
+        "notes": "A professional 2-sentence summary of the latest updates.",
+        "requires_manual_review": true/false
+    }
+
+    Respond ONLY with the JSON object."""
+
+
+# Trimmed system prompt for retry passes: JSON mode already enforces the
+# verdict schema server-side, so repeat attempts can drop the ~400 tokens
+# of format boilerplate and just restate the goal.
+ANALYZE_RETRY_SYSTEM_PROMPT = """You are a legal research assistant re-checking the named legal case.
+
+    Return the same JSON verdict object as before. Focus on finding a scheduled
+    court date AFTER the current date given by the user; if none exists, return
+    "Unknown" for next_hearing_date and keep the other fields accurate."""
+
+
+# Keep only the most recent attempts' scraped chunks to bound memory
+MAX_SCRAPE_CHUNKS = 3
+
+# Don't pay for a Gemini call on dud scrapes (e.g. a docket 404 page)
+MIN_ANALYZE_CHARS = 500
+
+# A docket scrape above this size is high-signal enough that retries skip
+# Google and just re-read the docket with a stricter prompt
+DOCKET_SATISFIED_CHARS = 2000
+
+# Schema enforced via Gemini JSON mode so the response is guaranteed to be
+# a bare, parseable JSON object (no markdown fences, no prose).
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "next_hearing_date": {"type": "string"},
+        "last_hearing_date": {"type": "string"},
+        "case_status": {"type": "string"},
+        "victim_name": {"type": "string"},
+        "suspect_name": {"type": "string"},
+        "confidence": {"type": "string"},
+        "notes": {"type": "string"},
+        "requires_manual_review": {"type": "boolean"},
+    },
+    "required": [
+        "next_hearing_date", "last_hearing_date", "case_status",
+        "victim_name", "suspect_name", "confidence", "notes",
+        "requires_manual_review",
+    ],
+}
+
+# Array variant for batched analysis: one verdict object per case
+VERDICT_LIST_SCHEMA = {
+    "type": "array",
+    "items": VERDICT_SCHEMA,
+}
+
+# Cap cases per batched Gemini call to stay inside context limits
+BATCH_ANALYZE_LIMIT = 8
+
+# Gemini latency has a long tail — cap the wait and retry once with a
+# more generous budget before giving up.
+LLM_TIMEOUT = 15.0
+LLM_RETRY_TIMEOUT = 30.0
 
+# Self-pace below provider limits so concurrent case runs never trip
+# 429 backoff. Gemini's tier limit is 150 RPM; search APIs are tighter.
+# asyncio primitives bind to the first event loop that awaits them, and
+# each research worker runs its own loop (asyncio.run per case) — a
+# module-level semaphore would strand a waiter in one loop waiting on a
+# release that happens in another. So the primitives are built per
+# running loop, with the provider budget split across the worker pool
+# to keep the aggregate rate at the original cap.
+_RESEARCH_WORKERS = max(1, int(os.getenv('RESEARCH_WORKERS', '4')))
+_GEMINI_RPM_PER_LOOP = max(1, 150 // _RESEARCH_WORKERS)
+_SEARCH_RPM_PER_LOOP = max(1, 60 // _RESEARCH_WORKERS)
+_GEMINI_CONCURRENT_PER_LOOP = max(1, 10 // _RESEARCH_WORKERS)
 
+_loop_limiters = {}
+_loop_limiters_lock = threading.Lock()
 
-def get_gemini_llm():
-    """Initialize and return the Gemini 2.5 Pro model.
+
+def _get_limiters():
+    """
+    Return (gemini_limiter, search_limiter, gemini_semaphore) bound to
+    the running event loop, creating them on first use. asyncio.run
+    loops close when their case finishes, so stale entries are pruned
+    on each miss instead of accumulating one per case.
+    """
+    loop = asyncio.get_running_loop()
+    with _loop_limiters_lock:
+        limiters = _loop_limiters.get(loop)
+        if limiters is None:
+            for stale in [l for l in _loop_limiters if l.is_closed()]:
+                del _loop_limiters[stale]
+            limiters = (
+                AsyncLimiter(_GEMINI_RPM_PER_LOOP, 60),
+                AsyncLimiter(_SEARCH_RPM_PER_LOOP, 60),
+                asyncio.Semaphore(_GEMINI_CONCURRENT_PER_LOOP),
+            )
+            _loop_limiters[loop] = limiters
+    return limiters
+
+# Tiered model selection: the extraction task is structured, so the
+# fast/cheap Flash model handles the easy majority and only
+# low-confidence verdicts are re-run on Pro.
+ANALYZE_MODEL = "gemini-2.5-flash"
+ESCALATION_MODEL = "gemini-2.5-pro"
+
+_cached_content = {}  # model -> (CachedContent name, refresh deadline)
+
+
+def _get_cached_system_content(model: str):
+    """
+    Best-effort Gemini CachedContent handle for the static system prompt.
+
+    Pre-caching the prompt server-side cuts billed input tokens and TTFT
+    on every analyze call. Returns None if the caching API rejects it
+    (e.g. prompt below the minimum token count) — callers then fall back
+    to sending the prompt inline.
+    """
+    name, expiry = _cached_content.get(model, (None, 0.0))
+    if name and time.time() < expiry:
+        return name
+
+    try:
+        import google.generativeai as genai
+        cached = genai.caching.CachedContent.create(
+            model=model,
+            system_instruction=ANALYZE_SYSTEM_PROMPT,
+            ttl="3600s",
+        )
+        _cached_content[model] = (cached.name, time.time() + 3300)  # refresh before the 1h TTL
+        return cached.name
+    except Exception as e:
+        logger.warning(f"⚠️ Gemini context caching unavailable: {e}")
+        _cached_content[model] = (None, time.time() + 300)  # back off instead of retrying every call
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def get_gemini_llm(model: str = ANALYZE_MODEL, cached_content: Optional[str] = None, batch: bool = False):
+    """Initialize and return a Gemini chat model (Flash by default).
 
     Auth precedence: VERTEX_API_KEY -> GEMINI_API_KEY -> GOOGLE_API_KEY.
+    Cached so each client (and its keep-alive HTTPS pool) is built once
+    per process instead of on every analyze call. With batch=True the
+    response schema is an array of verdicts instead of a single object.
     """
     api_key = (
         os.getenv("VERTEX_API_KEY")
@@ -54,23 +257,275 @@ def get_gemini_llm():
     if not api_key:
         raise ValueError("No API key set. Provide VERTEX_API_KEY (or GEMINI_API_KEY / GOOGLE_API_KEY).")
 
+    # Imported here (not at module scope) so importing agent stays cheap —
+    # langchain_google_genai pulls in the whole google.generativeai stack.
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    kwargs = {}
+    if cached_content:
+        kwargs["cached_content"] = cached_content
+
     return ChatGoogleGenerativeAI(
-        model="gemini-2.5-pro",
+        model=model,
         google_api_key=api_key,
         temperature=0.1,
+        # The verdict object is small; a tight cap stops the model from
+        # padding the stream with extra prose after the JSON closes.
+        max_output_tokens=4096 if batch else 1024,
         convert_system_message_to_human=True,
+        response_mime_type="application/json",
+        response_schema=VERDICT_LIST_SCHEMA if batch else VERDICT_SCHEMA,
+        **kwargs,
     )
 
 
+# ✅ FIX: Status Normalization (Vocabulary Mismatch) — precomputed once so
+# each verdict costs a dict lookup plus at most one C-level regex scan.
+_CANONICAL_STATUSES = {"Open", "Closed", "Verdict Reached", "Unknown"}
+_STATUS_MAP = {
+    "dismissed": "Closed",
+    "settled": "Closed",
+    "adjudicated": "Verdict Reached",
+    "sentenced": "Verdict Reached",
+    "stayed": "Open",
+    "adjourned": "Open",
+    "active": "Open",
+    "pending": "Open",
+}
+_STATUS_SUBSTR_RE = re.compile("|".join(map(re.escape, _STATUS_MAP)))
+_CLOSURE_SUBSTR_RE = re.compile("close|end|finish")
+
+# Tolerant YYYY-MM-DD / YYYY/MM/DD extractor for off-spec LLM dates —
+# much cheaper than the full dateutil tokenizer on the decision path
+_DATE_RE = re.compile(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})")
 
-PROGRESS = {}
+
+def _normalize_verdict(verdict: dict) -> dict:
+    """Fill in missing verdict keys and normalize the status vocabulary."""
+    verdict = {
+        "next_hearing_date": verdict.get("next_hearing_date", "Unknown"),
+        "last_hearing_date": verdict.get("last_hearing_date", "Unknown"),
+        "case_status": verdict.get("case_status", "Unknown"),
+        "victim_name": verdict.get("victim_name", "Unknown"),
+        "suspect_name": verdict.get("suspect_name", "Unknown"),
+        "confidence": verdict.get("confidence", "low"),
+        "notes": verdict.get("notes", ""),
+        "requires_manual_review": verdict.get("requires_manual_review", False)
+    }
+
+    raw_status = verdict["case_status"]
+    if raw_status not in _CANONICAL_STATUSES:
+        lowered = raw_status.lower()
+
+        # Exact lookup first, then one substring scan over the alternation
+        mapped = _STATUS_MAP.get(lowered)
+        if not mapped:
+            match = _STATUS_SUBSTR_RE.search(lowered)
+            if match:
+                mapped = _STATUS_MAP[match.group(0)]
+
+        if mapped:
+            logger.info(f"🔄 Normalized Status: '{raw_status}' -> '{mapped}'")
+            verdict["case_status"] = mapped
+        elif _CLOSURE_SUBSTR_RE.search(lowered):
+            # If still unknown but suggests closure
+            verdict["case_status"] = "Closed"
+        else:
+            verdict["case_status"] = "Open" # Default fallback safety
+
+    return verdict
+
+
+async def _invoke_analyze_llm(model: str, user_prompt: str,
+                              system_prompt: str = ANALYZE_SYSTEM_PROMPT) -> dict:
+    """Send the analyze prompt to the given model and parse the JSON verdict."""
+    # CachedContent only holds the full default prompt; trimmed retry
+    # prompts are cheap enough to send inline.
+    cached_content = None
+    if system_prompt is ANALYZE_SYSTEM_PROMPT:
+        # Creating/refreshing the CachedContent is a blocking HTTPS call;
+        # run it in the executor so the per-case loop (and its in-flight
+        # scrape/search tasks) never stalls behind it.
+        cached_content = await asyncio.get_running_loop().run_in_executor(
+            None, _get_cached_system_content, model
+        )
+    llm = get_gemini_llm(model=model, cached_content=cached_content)
+
+    if cached_content:
+        # The system prompt lives server-side in the CachedContent
+        messages = [HumanMessage(content=user_prompt)]
+    else:
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
+
+    async def consume_stream() -> str:
+        """Accumulate streamed tokens, returning early once the JSON closes.
+
+        Tracks brace depth instead of test-parsing on every chunk, but
+        only counts braces outside string literals — the free-form notes
+        field routinely quotes scraped text that can contain '{' or '}',
+        which would otherwise skew the depth and cut the stream
+        mid-object.
+        """
+        buf = []
+        depth = 0
+        opened = False
+        in_string = False
+        escaped = False
+        async for chunk in llm.astream(messages):
+            text = chunk.content or ""
+            if not text:
+                continue
+            buf.append(text)
+            for ch in text:
+                if escaped:
+                    escaped = False
+                elif in_string:
+                    if ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == '{':
+                    depth += 1
+                    opened = True
+                elif ch == '}':
+                    depth -= 1
+            if opened and depth <= 0:
+                break
+        return "".join(buf).strip()
+
+    gemini_limiter, _, gemini_sem = _get_limiters()
+    async with gemini_limiter, gemini_sem:
+        try:
+            response_text = await asyncio.wait_for(consume_stream(), timeout=LLM_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Gemini timed out after {LLM_TIMEOUT}s. Retrying once...")
+            response_text = await asyncio.wait_for(consume_stream(), timeout=LLM_RETRY_TIMEOUT)
+
+    try:
+        # JSON mode guarantees a bare object — parse directly
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        # Fallback in case JSON mode is ever ignored: raw_decode from the
+        # first brace instead of backtracking a regex over the response.
+        start = response_text.find('{')
+        if start != -1:
+            try:
+                verdict, _ = _JSON_DECODER.raw_decode(response_text[start:])
+                return verdict
+            except json.JSONDecodeError:
+                pass
+        raise ValueError("Could not parse JSON from response")
+
+
+
+# Reusable decoder for the analyze fallback parse path
+_JSON_DECODER = json.JSONDecoder()
+
+
+# Exact-match cache for analyze calls: the same prompt always yields the
+# same verdict, so repeat runs skip the Gemini round-trip entirely.
+_LLM_CACHE = Cache("./.llm_cache")
+_LLM_CACHE_TTL = 86400  # 24 hours
+
+# Whole-run cache: re-researching the same case on the same day skips the
+# entire search -> scrape -> LLM pipeline.
+_CASE_CACHE = Cache("./.case_cache")
+_CASE_CACHE_TTL = 86400  # 24 hours
+
+# In-process front for the whole-run cache, keyed by a blake2b hash of
+# (case_name, docket_url). Answers duplicate invocations within the hour
+# (UI double-submits, crash-recovery retries) without the disk read.
+# cachetools caches are not thread-safe (eviction maintains a linked
+# ring), so every access goes through the lock — same discipline as
+# app.py's read cache.
+_HOT_CASE_CACHE = TTLCache(maxsize=1000, ttl=3600)
+_hot_case_lock = threading.Lock()
+
+
+# Per-case progress payloads. A TTLCache instead of a plain dict so
+# finished cases are evicted automatically rather than leaking forever.
+# Written by the research workers and read by Flask's polling/SSE
+# threads, so access is lock-guarded; readers go through
+# get_progress_snapshot.
+PROGRESS = TTLCache(maxsize=10_000, ttl=3600)
+_progress_cache_lock = threading.Lock()
+
+
+def get_progress_snapshot(case_id):
+    """Thread-safe read of the latest progress payload for a case."""
+    with _progress_cache_lock:
+        return PROGRESS.get(case_id)
 
 from db import update_case, get_supabase_client
 
+# Progress DB writes are coalesced: update_progress enqueues, and a single
+# background worker flushes the LATEST payload per case every 250ms.
+# Intermediate percentages are lossy by design, so 8+ synchronous Supabase
+# round-trips per case collapse into 1-2.
+_PROGRESS_FLUSH_INTERVAL = 0.25
+_progress_db_queue = queue.SimpleQueue()
+
+
+def _progress_flush_worker():
+    while True:
+        time.sleep(_PROGRESS_FLUSH_INTERVAL)
+
+        latest = {}
+        while True:
+            try:
+                case_id, payload = _progress_db_queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[case_id] = payload
+
+        for case_id, payload in latest.items():
+            try:
+                update_case(case_id, payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Progress DB save failed: {e}")
+
+
+_progress_flush_thread = threading.Thread(
+    target=_progress_flush_worker, name="progress-flush", daemon=True
+)
+_progress_flush_thread.start()
+
+
+# SSE listeners: the Flask layer registers a queue per streaming client
+# and update_progress fans each payload out to them, so connected
+# clients get events pushed instead of polling.
+_progress_listeners = {}
+_progress_listeners_lock = threading.Lock()
+
+
+def subscribe_progress(case_id):
+    """Register and return a listener queue for a case's progress events."""
+    q = queue.SimpleQueue()
+    with _progress_listeners_lock:
+        _progress_listeners.setdefault(case_id, []).append(q)
+    return q
+
+
+def unsubscribe_progress(case_id, q):
+    """Remove a listener queue registered via subscribe_progress."""
+    with _progress_listeners_lock:
+        listeners = _progress_listeners.get(case_id)
+        if listeners and q in listeners:
+            listeners.remove(q)
+            if not listeners:
+                del _progress_listeners[case_id]
+
+
 def update_progress(case_id, step, percent, message):
     """
     Update the progress for a specific case.
-    Persists to BOTH memory (fast access) and Database (resilience).
+    Persists to BOTH memory (fast access, synchronous) and Database
+    (resilience, batched via the background flush worker).
     """
     if case_id:
         status_payload = {
@@ -81,132 +536,220 @@ def update_progress(case_id, step, percent, message):
         }
         if percent >= 100:
             status_payload["status"] = "complete"
-            
-        PROGRESS[case_id] = status_payload
 
-        try:
-            db_status = "processing"
-            if percent >= 100:
-                db_status = "complete"
-            
-            update_case(case_id, {
-                "processing_status": db_status,
-                "progress_percent": percent,
-                "progress_message": message
-            })
-        except Exception as e:
-            print(f"⚠️ Progress DB save failed: {e}")
+        with _progress_cache_lock:
+            PROGRESS[case_id] = status_payload
+
+        with _progress_listeners_lock:
+            listeners = list(_progress_listeners.get(case_id, ()))
+        for listener in listeners:
+            listener.put_nowait(status_payload)
+
+        db_status = "processing"
+        if percent >= 100:
+            db_status = "complete"
+
+        _progress_db_queue.put_nowait((case_id, {
+            "processing_status": db_status,
+            "progress_percent": percent,
+            "progress_message": message
+        }))
 
 
 
-def node_search(state: AgentState) -> AgentState:
+async def node_search(state: AgentState) -> AgentState:
     """
     Hybrid Search Node:
-    - Attempt 0: If 'docket_url' exists, scrape it directly.
+    - Attempt 0: If 'docket_url' exists, scrape it AND run the Google
+      fallback speculatively in parallel, keeping whichever is needed.
     - Attempt 1+: If Docket failed or missing, use Google Search.
+    Scrapes all target URLs concurrently (bounded by a semaphore).
     """
     case_name = state["case_name"]
     case_id = state.get("case_id")  # Get case_id from state
     docket_url = state.get("docket_url")
     search_attempts = state.get("search_attempts", 0)
 
-    update_progress(case_id, "search", 20 + (search_attempts * 10), f"Searching: Attempt {search_attempts + 1}")
+    # If node_analyze launched this search speculatively while Gemini was
+    # still running, the work is already done (or in flight) — just await it.
+    spec_task = state.get("speculative_task")
+    if spec_task is not None:
+        logger.info("♻️ Consuming speculative retry search started during analysis.")
+        result = await spec_task
+        return {**result, "speculative_task": None}
 
-    if search_attempts == 0 and docket_url:
-        print(f"🔗 Checking Official Docket URL: {docket_url}")
-        update_progress(case_id, "search", 25, "Accessing Official Docket...")
-        try:
-            scraped_content = scrape_with_god_mode(docket_url)
+    update_progress(case_id, "search", 20 + (search_attempts * 10), f"Searching: Attempt {search_attempts + 1}")
 
-            if scraped_content:
-                print(f"✅ Successfully scraped official docket ({len(scraped_content)} chars)")
-                return {
-                    **state,
-                    "search_attempts": search_attempts + 1,
-                    "scraped_data": f"## OFFICIAL DOCKET SOURCE ({docket_url})\n\n{scraped_content[:20000]}",
-                    "search_results": f"Direct scrape of {docket_url}",
-                    "error_message": ""
-                }
-            else:
-                print("❌ Official docket scrape returned empty. Falling back to search.")
-                search_attempts += 1 
-        except Exception as e:
-            print(f"❌ Docket scrape failed: {e}")
-            search_attempts += 1 
+    async def run_google_fallback(attempt: int) -> dict:
+        """
+        Google search + concurrent scrape of the top results.
+        All query variants are searched in one concurrent wave and their
+        URLs deduped into a single scrape pass, instead of burning one
+        retry attempt per variant.
+        """
+        loop = asyncio.get_running_loop()
 
-    try:
-        update_progress(case_id, "search", 30 + (search_attempts * 10), "Running Google Search...")
-        if search_attempts == 0:
-            query = f"latest court hearing {case_name}"
-        elif search_attempts == 1:
+        update_progress(case_id, "search", 30 + (attempt * 10), "Running Google Search...")
+        queries = [
+            f"latest court hearing {case_name}",
             # ✅ FIX: Ask for news articles which are text-based (PDFs often unreadable)
-            query = f"latest news article {case_name} court hearing date"
-        else:
-            query = f"court case status {case_name}"
-        
-        print(f"🔍 Search attempt {search_attempts + 1} (Google): '{query}'")
-        
-        search_results = search_web.invoke({"query": query})
-        
-        update_progress(case_id, "search", 40 + (search_attempts * 10), "Scanning Search Results...")
+            f"latest news article {case_name} court hearing date",
+            f"court case status {case_name}",
+        ]
+        # Primary query rotates on retries so the snippet text varies too
+        primary_query = queries[min(attempt, len(queries) - 1)]
+
+        logger.info(f"🔍 Search attempt {attempt + 1} (Google): '{primary_query}'")
+
+        _, search_limiter, _ = _get_limiters()
+
+        async def limited_search_urls(q: str) -> list:
+            async with search_limiter:
+                return await loop.run_in_executor(None, get_search_urls, q)
+
+        # search_web/get_search_urls are blocking (requests) — run them in
+        # the default executor, all variants in one concurrent wave.
+        async with search_limiter:
+            t_results = loop.run_in_executor(
+                None, lambda: search_web.invoke({"query": primary_query})
+            )
+            url_waves = asyncio.gather(*(limited_search_urls(q) for q in queries))
+            search_results, url_lists = await asyncio.gather(t_results, url_waves)
+
+        update_progress(case_id, "search", 40 + (attempt * 10), "Scanning Search Results...")
+
+        # Union the variants' URLs, interleaved by rank and deduped —
+        # both within this wave and against URLs prior attempts scraped
+        already_seen = set(state.get("seen_urls") or [])
+        urls = []
+        seen = set()
+        for wave in itertools.zip_longest(*url_lists):
+            for url in wave:
+                if url and url not in seen and url not in already_seen:
+                    seen.add(url)
+                    urls.append(url)
 
-        urls = get_search_urls(query)
         scraped_data = ""
-        
+        target_urls = []
+
         if urls:
-            target_urls = urls[:5]  # ✅ FIX: Read top 5 results to catch buried dates
-            print(f"🚀 Engaging God Mode (Searcher) for {len(target_urls)} URLs...")
-            
-            update_progress(case_id, "search", 45 + (search_attempts * 10), f"Reading {len(target_urls)} Sources...")
-            
-            batch_results = scrape_multiple_with_god_mode(target_urls)
-            
+            target_urls = urls[:6]  # ✅ FIX: Read the top results to catch buried dates
+            logger.info(f"🚀 Engaging God Mode (Searcher) for {len(target_urls)} URLs...")
+
+            update_progress(case_id, "search", 45 + (attempt * 10), f"Reading {len(target_urls)} Sources...")
+
+            batch_results = await run_crawler_parallel(target_urls, max_concurrency=5, max_chars=5000)
+
             scraped_parts = []
             for url, content in batch_results.items():
                 if content:
-                    print(f"✅ Downloaded {len(content)} characters from {url}")
-                    scraped_parts.append(f"## Web Source: {url}\n\n{content[:5000]}")
+                    logger.debug("✅ Downloaded %d characters from %s", len(content), url)
+                    scraped_parts.append(f"## Web Source: {url}\n\n{content}")
                 else:
-                     print(f"❌ Scrape failed for {url}")
-            
+                     logger.error(f"❌ Scrape failed for {url}")
+
             scraped_data = "\n\n---\n\n".join(scraped_parts)
-        
-        previous_data = state.get("scraped_data", "")
-        combined_data = f"{previous_data}\n\n--- Search Attempt {search_attempts + 1} ---\n\n{scraped_data}"
-        
+
         return {
-            **state,
-            "search_attempts": search_attempts + 1,
             "search_results": search_results,
-            "scraped_data": combined_data.strip(),
-            "error_message": ""
-        }
-    
-    except Exception as e:
-        print(f"❌ Search error: {e}")
-        return {
-            **state,
-            "search_attempts": search_attempts + 1,
-            "error_message": f"Search failed: {str(e)}"
+            "scraped_data": scraped_data,
+            "scraped_urls": target_urls,
         }
 
+    if search_attempts == 0 and docket_url:
+        logger.info(f"🔗 Checking Official Docket URL: {docket_url}")
+        update_progress(case_id, "search", 25, "Accessing Official Docket...")
+
+        # Speculative execution: fire the docket scrape AND the Google
+        # fallback together, so a dead docket URL costs no extra wall-clock.
+        t_docket = asyncio.ensure_future(run_crawler(docket_url, max_chars=20000))
+        t_search = asyncio.ensure_future(run_google_fallback(0))
+        await asyncio.wait({t_docket, t_search}, return_when=asyncio.FIRST_COMPLETED)
 
-def node_analyze(state: AgentState) -> AgentState:
+        scraped_content = None
+        try:
+            scraped_content = await t_docket
+        except Exception as e:
+            logger.error(f"❌ Docket scrape failed: {e}")
+
+        if scraped_content:
+            logger.info(f"✅ Successfully scraped official docket ({len(scraped_content)} chars)")
+
+            # If the speculative search already finished, stash it so a
+            # retry loop doesn't redo the same query. Otherwise cancel it.
+            prefetch = None
+            if t_search.done() and not t_search.cancelled() and not t_search.exception():
+                prefetch = t_search.result()
+            else:
+                t_search.cancel()
+
+            return {
+                "search_attempts": search_attempts + 1,
+                "scraped_data": [f"## OFFICIAL DOCKET SOURCE ({docket_url})\n\n{scraped_content}"],
+                "search_results": f"Direct scrape of {docket_url}",
+                "prefetch_search": prefetch,
+                "docket_satisfied": len(scraped_content) > DOCKET_SATISFIED_CHARS,
+                "seen_urls": (state.get("seen_urls") or []) + [docket_url],
+                "error_message": ""
+            }
+
+        logger.error("❌ Official docket scrape returned empty. Using speculative Google results.")
+        search_attempts += 1
+        try:
+            fallback = await t_search
+        except Exception as e:
+            logger.error(f"❌ Search error: {e}")
+            return {
+                "search_attempts": search_attempts + 1,
+                "error_message": f"Search failed: {str(e)}"
+            }
+    else:
+        # Consume a prefetched speculative search before paying for a new one.
+        fallback = state.get("prefetch_search")
+        if fallback:
+            logger.info("♻️ Reusing speculative search results from the docket attempt.")
+        else:
+            try:
+                fallback = await run_google_fallback(search_attempts)
+            except Exception as e:
+                logger.error(f"❌ Search error: {e}")
+                return {
+                    "search_attempts": search_attempts + 1,
+                    "error_message": f"Search failed: {str(e)}"
+                }
+
+    # Append this attempt's chunk instead of re-concatenating one big string
+    chunks = list(state.get("scraped_data") or [])
+    chunks.append(f"--- Search Attempt {search_attempts + 1} ---\n\n{fallback['scraped_data']}")
+
+    return {
+        "search_attempts": search_attempts + 1,
+        "search_results": fallback["search_results"],
+        "scraped_data": chunks[-MAX_SCRAPE_CHUNKS:],
+        "prefetch_search": None,
+        "seen_urls": (state.get("seen_urls") or []) + fallback.get("scraped_urls", []),
+        "error_message": ""
+    }
+
+
+async def node_analyze(state: AgentState) -> AgentState:
     """
     Analyze node: Feeds scraped data to Gemini 2.5 Pro for information extraction.
     """
     case_name = state["case_name"]
     case_id = state.get("case_id")
-    scraped_data = state.get("scraped_data", "")
+    scraped_data = "\n\n---\n\n".join(state.get("scraped_data") or [])
     search_results = state.get("search_results", "")
     
     update_progress(case_id, "analyze", 70, "Analyzing Legal Data (Gemini)...")
 
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    # Computed once per case in research_case and threaded through state
+    current_date = (state.get("today") or date.today()).isoformat()
     
-    if not scraped_data and not search_results:
+    # Fast path: skip the LLM entirely when there's nothing worth analyzing,
+    # so node_decision can retry the search without a wasted Gemini call.
+    if len(scraped_data) < MIN_ANALYZE_CHARS and not search_results:
         return {
-            **state,
             "final_verdict": {
                 "next_hearing_date": "Unknown",
                 "last_hearing_date": "Unknown",
@@ -216,128 +759,73 @@ def node_analyze(state: AgentState) -> AgentState:
                 "confidence": "low",
                 "notes": "No data available to analyze.",
                 "requires_manual_review": True
-            }
+            },
+            "error_message": "insufficient_data"
         }
-    
-    try:
-        llm = get_gemini_llm()
-        
-        system_prompt = f"""You are a legal research assistant. Analyze the following text regarding the case '{case_name}'.
-    Current Date: {current_date}
-
-    Your Goal: Extract the timeline of the case.
-    
-    1. **Next Hearing Date:** Find any scheduled court date happening AFTER {current_date}. 
-       - If none, return "Unknown".
-    2. **Last Hearing Date:** Find the most recent court date that happened BEFORE {current_date}.
-       - If the case is Closed, this is the date it was closed/verdict read.
-    3. **Status:** "Open", "Closed", or "Verdict Reached".
-    
-    Return STRICT JSON format:
-    {{
-        "next_hearing_date": "YYYY-MM-DD" or "Unknown",
-        "last_hearing_date": "YYYY-MM-DD" or "Unknown",
-        "case_status": "Open/Closed/Verdict Reached",
-        "victim_name": "Name or Unknown",
-        "suspect_name": "Name or Unknown",
-        "confidence": "high/medium/low",
-        "notes": "A professional 2-sentence summary of the latest updates.",
-        "requires_manual_review": true/false
-    }}
-    
-    Respond ONLY with the JSON object."""
 
+    spec_task = None
+    try:
         user_prompt = f"""Analyze the following content for the legal case: "{case_name}"
-        
+Current Date: {current_date}
+
 === SEARCH RESULTS ===
 {search_results}
 
 === SCRAPED WEB CONTENT ===
 {scraped_data}  # ✅ FIX: Send EVERYTHING. Gemini can handle it.
 """
- 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
-        
-        response = llm.invoke(messages)
-        response_text = response.content.strip()
-        
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-        if json_match:
-            response_text = json_match.group(1)
-        
-        try:
-            verdict = json.loads(response_text)
-        except json.JSONDecodeError:
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                verdict = json.loads(json_match.group())
-            else:
-                raise ValueError("Could not parse JSON from response")
-        
-        verdict = {
-            "next_hearing_date": verdict.get("next_hearing_date", "Unknown"),
-            "last_hearing_date": verdict.get("last_hearing_date", "Unknown"),
-            "case_status": verdict.get("case_status", "Unknown"),
-            "victim_name": verdict.get("victim_name", "Unknown"),
-            "suspect_name": verdict.get("suspect_name", "Unknown"),
-            "confidence": verdict.get("confidence", "low"),
-            "notes": verdict.get("notes", ""),
-            "requires_manual_review": verdict.get("requires_manual_review", False)
-        }
 
-        # ✅ FIX: Status Normalization (Vocabulary Mismatch)
-        raw_status = verdict.get("case_status", "Unknown")
-        status_map = {
-            "Dismissed": "Closed",
-            "Settled": "Closed",
-            "Adjudicated": "Verdict Reached",
-            "Sentenced": "Verdict Reached",
-            "Stayed": "Open",
-            "Adjourned": "Open", 
-            "Active": "Open",
-            "Pending": "Open" 
-        }
+        # Retries get the trimmed prompt — fewer input tokens on a call
+        # whose schema is already enforced by JSON mode.
+        system_prompt = ANALYZE_RETRY_SYSTEM_PROMPT if state.get("search_attempts", 0) > 1 else ANALYZE_SYSTEM_PROMPT
 
-        # If exact match fails, check the map
-        if raw_status not in ["Open", "Closed", "Verdict Reached", "Unknown"]:
-             # Try direct map
-            mapped = status_map.get(raw_status)
-            if not mapped:
-                # Try case insensitive
-                for key, val in status_map.items():
-                    if key.lower() in raw_status.lower():
-                        mapped = val
-                        break
-            
-            if mapped:
-                print(f"🔄 Normalized Status: '{raw_status}' -> '{mapped}'")
-                verdict["case_status"] = mapped
-            else:
-                # If still unknown but suggests closure
-                if any(x in raw_status.lower() for x in ['close', 'end', 'finish']):
-                    verdict["case_status"] = "Closed"
-                else:
-                    verdict["case_status"] = "Open" # Default fallback safety
+        cache_key = hashlib.sha256((system_prompt + user_prompt).encode()).hexdigest()
+        cached_verdict = _LLM_CACHE.get(cache_key)
+        if cached_verdict is not None:
+            logger.info("⚡ Analyze cache hit. Skipping Gemini call.")
+            update_progress(case_id, "analyze", 90, "Finalizing Verdict...")
+            return {
+                "final_verdict": cached_verdict,
+                "speculative_task": spec_task,
+                "error_message": ""
+            }
 
-        
-        
-        print(f"📋 Analysis complete: {json.dumps(verdict, indent=2)}")
+        # Pipelining: while Gemini analyzes, speculatively start the retry
+        # search it might ask for. node_decision cancels it when the verdict
+        # is final; node_search consumes it when a retry happens. seen_urls
+        # dedupe keeps the speculative pass from re-scraping anything.
+        if state.get("search_attempts", 0) < 2 and not state.get("docket_satisfied") and not state.get("prefetch_search"):
+            spec_task = asyncio.ensure_future(
+                node_search({**state, "case_id": None, "speculative_task": None})
+            )
+
+        verdict = await _invoke_analyze_llm(ANALYZE_MODEL, user_prompt, system_prompt=system_prompt)
+
+        # Escalate only the hard cases: re-run with Pro when Flash is unsure
+        if verdict.get("confidence") == "low" and verdict.get("requires_manual_review"):
+            logger.info(f"🔁 {ANALYZE_MODEL} returned low confidence. Escalating to {ESCALATION_MODEL}...")
+            verdict = await _invoke_analyze_llm(ESCALATION_MODEL, user_prompt, system_prompt=system_prompt)
+
+        verdict = _normalize_verdict(verdict)
+
+        _LLM_CACHE.set(cache_key, verdict, expire=_LLM_CACHE_TTL)
+
+        logger.info(f"📋 Analysis complete for '{case_name}' (status: {verdict['case_status']})")
+        # Lazy %s formatting: the pretty-printed verdict is only rendered
+        # when debug logging is actually enabled.
+        logger.debug("📋 Verdict: %s", verdict)
         
         update_progress(case_id, "analyze", 90, "Finalizing Verdict...")
 
         return {
-            **state,
             "final_verdict": verdict,
+            "speculative_task": spec_task,
             "error_message": ""
         }
     
     except Exception as e:
-        print(f"❌ Analysis error: {e}")
+        logger.error(f"❌ Analysis error: {e}")
         return {
-            **state,
             "final_verdict": {
                 "next_hearing_date": "Unknown",
                 "last_hearing_date": "Unknown",
@@ -348,11 +836,61 @@ def node_analyze(state: AgentState) -> AgentState:
                 "notes": f"Analysis failed: {str(e)}",
                 "requires_manual_review": True
             },
+            "speculative_task": spec_task,
+            "error_message": str(e)
+        }
+
+
+async def node_reanalyze(state: AgentState) -> AgentState:
+    """
+    Retry node for docket-satisfied cases: re-reads the already-scraped
+    docket content with a stricter prompt instead of paying for another
+    Google search + scrape round-trip.
+    """
+    case_name = state["case_name"]
+    case_id = state.get("case_id")
+    search_attempts = state.get("search_attempts", 0)
+    scraped_data = "\n\n---\n\n".join(state.get("scraped_data") or [])
+    # Computed once per case in research_case and threaded through state
+    current_date = (state.get("today") or date.today()).isoformat()
+
+    update_progress(case_id, "analyze", 75, "Re-reading Official Docket...")
+    logger.info(f"📑 Docket satisfied — re-analyzing existing data (pass {search_attempts + 1}) instead of re-searching.")
+
+    user_prompt = f"""Re-analyze the following OFFICIAL DOCKET content for the legal case: "{case_name}"
+Current Date: {current_date}
+Re-analysis pass: {search_attempts + 1}
+
+Look harder for concrete dates: continuances, status conferences, motion
+hearings and sentencing dates all count as hearings.
+
+=== SCRAPED WEB CONTENT ===
+{scraped_data}
+"""
+
+    try:
+        verdict = _normalize_verdict(await _invoke_analyze_llm(ANALYZE_MODEL, user_prompt))
+        return {
+            "search_attempts": search_attempts + 1,
+            "final_verdict": verdict,
+            "error_message": ""
+        }
+    except Exception as e:
+        logger.error(f"❌ Re-analysis error: {e}")
+        return {
+            "search_attempts": search_attempts + 1,
             "error_message": str(e)
         }
 
 
-def node_decision(state: AgentState) -> Literal["node_search", "end"]:
+def _cancel_speculative(state: AgentState):
+    """Drop an in-flight speculative retry search once the verdict is final."""
+    spec_task = state.get("speculative_task")
+    if spec_task is not None and not spec_task.done():
+        spec_task.cancel()
+
+
+def node_decision(state: AgentState) -> Literal["node_search", "node_reanalyze", "end"]:
     verdict = state.get("final_verdict", {})
     search_attempts = state.get("search_attempts", 0)
     
@@ -360,35 +898,53 @@ def node_decision(state: AgentState) -> Literal["node_search", "end"]:
     next_date = verdict.get("next_hearing_date", "Unknown")
 
     if status in ["Closed", "Verdict Reached"]:
-        print(f"🛑 Case is {status}. Stopping research.")
+        logger.info(f"🛑 Case is {status}. Stopping research.")
+        _cancel_speculative(state)
         return "end"
 
     if next_date and next_date != "Unknown":
         try:
-            # Try standard format first
-            parsed_date = datetime.strptime(next_date, "%Y-%m-%d").date()
+            # Try standard format first (fromisoformat is ~10x faster than strptime)
+            parsed_date = date.fromisoformat(next_date[:10])
         except ValueError:
-            try:
-                # Fallback for other formats
-                parsed_date = dateutil.parser.parse(next_date).date()
-            except:
-                parsed_date = None
+            # The prompt mandates YYYY-MM-DD, so off-spec answers are
+            # usually just a date embedded in extra text — pull it out
+            # with a regex instead of paying for the dateutil tokenizer.
+            match = _DATE_RE.search(next_date)
+            if match:
+                try:
+                    parsed_date = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+                except ValueError:
+                    parsed_date = None
+            else:
+                try:
+                    # Last resort for free-form dates ("March 3, 2026");
+                    # imported lazily so the common paths never pay for it
+                    import dateutil.parser
+                    parsed_date = dateutil.parser.parse(next_date).date()
+                except:
+                    parsed_date = None
 
         if parsed_date:
-            if parsed_date >= date.today():
-                print(f"✅ Future hearing found: {next_date} (parsed as {parsed_date})")
+            if parsed_date >= (state.get("today") or date.today()):
+                logger.info(f"✅ Future hearing found: {next_date} (parsed as {parsed_date})")
+                _cancel_speculative(state)
                 return "end"
             else:
-                print(f"⚠️ Date is in the past: {next_date} (parsed as {parsed_date}). Case is OPEN. Retrying...")
+                logger.warning(f"⚠️ Date is in the past: {next_date} (parsed as {parsed_date}). Case is OPEN. Retrying...")
                 verdict["last_hearing_date"] = next_date 
                 verdict["next_hearing_date"] = "Unknown"
         else:
-            print(f"⚠️ Could not parse date: {next_date}")
+            logger.warning(f"⚠️ Could not parse date: {next_date}")
 
     if search_attempts < 2:
-        print(f"🔄 Retrying search (attempt {search_attempts + 1}/2)")
+        if state.get("docket_satisfied"):
+            logger.info(f"🔄 Retrying via docket re-analysis (attempt {search_attempts + 1}/2)")
+            return "node_reanalyze"
+        logger.info(f"🔄 Retrying search (attempt {search_attempts + 1}/2)")
         return "node_search"
-    
+
+    _cancel_speculative(state)
     return "end"
 
 
@@ -398,56 +954,236 @@ def build_research_agent():
     workflow = StateGraph(AgentState)
     workflow.add_node("node_search", node_search)
     workflow.add_node("node_analyze", node_analyze)
+    workflow.add_node("node_reanalyze", node_reanalyze)
     workflow.set_entry_point("node_search")
     workflow.add_edge("node_search", "node_analyze")
     workflow.add_conditional_edges("node_analyze", node_decision, {
             "node_search": "node_search",
+            "node_reanalyze": "node_reanalyze",
+            "end": END
+        })
+    workflow.add_conditional_edges("node_reanalyze", node_decision, {
+            "node_search": "node_search",
+            "node_reanalyze": "node_reanalyze",
             "end": END
         })
     return workflow.compile()
 
-research_agent = build_research_agent()
 
+@functools.lru_cache(maxsize=1)
+def get_research_agent():
+    """Compile the research agent on first use instead of at import time."""
+    return build_research_agent()
 
 
-def research_case(case_name: str, docket_url: Optional[str] = None, case_id: Optional[int] = None) -> dict:
+
+async def research_case_async(case_name: str, docket_url: Optional[str] = None, case_id: Optional[int] = None) -> dict:
     """
-    Research a legal case using the autonomous agent.
+    Research a legal case using the autonomous agent (async entry point).
+
+    This is the native interface: async callers can run many cases
+    concurrently on one event loop instead of one thread per case.
     """
-    print(f"\n{'='*60}")
-    print(f"🔎 Starting research for case: {case_name}")
+    today = date.today()
+
+    # Hot duplicate guard (UI double-submit, crash-recovery re-dispatch):
+    # an in-process TTL cache answers before we even touch the disk cache.
+    hot_key = hashlib.blake2b(
+        f"{case_name.strip().lower()}|{docket_url or ''}".encode(), digest_size=16
+    ).hexdigest()
+    with _hot_case_lock:
+        hot_result = _HOT_CASE_CACHE.get(hot_key)
+    if hot_result is not None:
+        logger.info(f"⚡ Hot verdict cache hit for '{case_name}' (<1h). Skipping research.")
+        update_progress(case_id, "complete", 100, "Research Complete!")
+        return hot_result
+
+    cache_key = (case_name.strip().lower(), docket_url or "", today.isoformat())
+    cached_result = _CASE_CACHE.get(cache_key)
+    if cached_result is not None:
+        logger.info(f"⚡ Verdict cache hit for '{case_name}' (today). Skipping research.")
+        update_progress(case_id, "complete", 100, "Research Complete!")
+        with _hot_case_lock:
+            _HOT_CASE_CACHE[hot_key] = cached_result
+        return cached_result
+
+    logger.info(f"\n{'='*60}")
+    logger.info(f"🔎 Starting research for case: {case_name}")
     if docket_url:
-        print(f"🔗 Docket URL provided: {docket_url}")
-    print(f"{'='*60}\n")
-    
+        logger.info(f"🔗 Docket URL provided: {docket_url}")
+    logger.info(f"{'='*60}\n")
+
     update_progress(case_id, "start", 5, "Initializing Agent...")
 
     initial_state: AgentState = {
         "case_name": case_name,
         "docket_url": docket_url,
-        "case_id": case_id,             # Pass ID to state 
+        "case_id": case_id,             # Pass ID to state
         "search_attempts": 0,
-        "scraped_data": "",
+        "scraped_data": [],
         "final_verdict": {},
         "search_results": "",
-        "error_message": ""
+        "error_message": "",
+        "prefetch_search": None,
+        "docket_satisfied": False,
+        "seen_urls": [],
+        "today": today,
+        "speculative_task": None
     }
     
-    final_state = research_agent.invoke(initial_state)
-    
+    final_state = await get_research_agent().ainvoke(initial_state)
+
     update_progress(case_id, "complete", 100, "Research Complete!")
 
-    print(f"\n{'='*60}")
-    print("✅ Research complete!")
-    print(f"{'='*60}\n")
+    logger.info(f"\n{'='*60}")
+    logger.info("✅ Research complete!")
+    logger.info(f"{'='*60}\n")
     
-    return {
+    result = {
         "case_name": case_name,
         "search_attempts": final_state.get("search_attempts", 0),
         "verdict": final_state.get("final_verdict", {}),
         "success": not final_state.get("final_verdict", {}).get("requires_manual_review", False)
     }
 
+    # Only cache clean runs — a failed verdict should be retryable today
+    if result["success"]:
+        with _hot_case_lock:
+            _HOT_CASE_CACHE[hot_key] = result
+        _CASE_CACHE.set(cache_key, result, expire=_CASE_CACHE_TTL)
+
+    return result
+
+
+def invalidate_case_cache(case_name: str, docket_url: Optional[str] = None):
+    """
+    Drop today's cached verdict (and the docket's cached scrape) for a
+    case so the next run re-researches from scratch. Used when the user
+    explicitly asks for a refresh.
+    """
+    hot_key = hashlib.blake2b(
+        f"{case_name.strip().lower()}|{docket_url or ''}".encode(), digest_size=16
+    ).hexdigest()
+    with _hot_case_lock:
+        _HOT_CASE_CACHE.pop(hot_key, None)
+    _CASE_CACHE.delete((case_name.strip().lower(), docket_url or "", date.today().isoformat()))
+    if docket_url:
+        clear_scrape_cache(docket_url)
+
+
+def research_case(case_name: str, docket_url: Optional[str] = None, case_id: Optional[int] = None) -> dict:
+    """
+    Research a legal case using the autonomous agent.
+    Sync wrapper around research_case_async for the CLI and thread callers.
+    """
+    return asyncio.run(research_case_async(case_name, docket_url, case_id))
+
+
+
+async def research_cases_batch(cases: list) -> list:
+    """
+    Research multiple cases in one go.
+
+    All search/scrape phases run concurrently, then Gemini analyzes the
+    cases in groups of BATCH_ANALYZE_LIMIT with a single request per
+    group, amortizing the model round-trip across the batch.
+
+    Args:
+        cases: List of (case_name, docket_url, case_id) tuples.
+
+    Returns:
+        List of result dicts (same shape as research_case) in input order.
+    """
+    today = date.today()
+
+    async def run_search(case_name, docket_url, case_id):
+        state: AgentState = {
+            "case_name": case_name,
+            "docket_url": docket_url,
+            "case_id": case_id,
+            "search_attempts": 0,
+            "scraped_data": [],
+            "final_verdict": {},
+            "search_results": "",
+            "error_message": "",
+            "prefetch_search": None,
+            "docket_satisfied": False,
+            "seen_urls": [],
+            "today": today,
+            "speculative_task": None
+        }
+        try:
+            state.update(await node_search(state))
+        except Exception as e:
+            logger.error(f"❌ Batch search failed for {case_name}: {e}")
+            state["error_message"] = f"Search failed: {str(e)}"
+        return state
+
+    logger.info(f"🔎 Starting batch research for {len(cases)} cases")
+    states = await asyncio.gather(
+        *(run_search(name, docket_url, case_id) for name, docket_url, case_id in cases)
+    )
+
+    current_date = today.isoformat()
+    results = []
+
+    for start in range(0, len(states), BATCH_ANALYZE_LIMIT):
+        group = states[start:start + BATCH_ANALYZE_LIMIT]
+
+        sections = []
+        for i, state in enumerate(group, 1):
+            scraped = "\n\n---\n\n".join(state.get("scraped_data") or [])
+            sections.append(
+                f'CASE {i}: "{state["case_name"]}"\n\n'
+                f"=== SEARCH RESULTS ===\n{state.get('search_results', '')}\n\n"
+                f"=== SCRAPED WEB CONTENT ===\n{scraped}"
+            )
+
+        user_prompt = (
+            f"Analyze the following {len(group)} legal cases.\n"
+            f"Current Date: {current_date}\n\n"
+            "Return a JSON array with exactly one verdict object per case, in the same order.\n\n"
+            + "\n\n====================\n\n".join(sections)
+        )
+
+        verdicts = []
+        try:
+            llm = get_gemini_llm(model=ANALYZE_MODEL, batch=True)
+            messages = [
+                SystemMessage(content=ANALYZE_SYSTEM_PROMPT),
+                HumanMessage(content=user_prompt)
+            ]
+            gemini_limiter, _, gemini_sem = _get_limiters()
+            async with gemini_limiter, gemini_sem:
+                response = await asyncio.wait_for(llm.ainvoke(messages), timeout=LLM_RETRY_TIMEOUT)
+            verdicts = orjson.loads(response.content.strip())
+        except Exception as e:
+            logger.error(f"❌ Batch analysis error: {e}")
+
+        for i, state in enumerate(group):
+            if isinstance(verdicts, list) and i < len(verdicts):
+                verdict = _normalize_verdict(verdicts[i])
+            else:
+                verdict = {
+                    "next_hearing_date": "Unknown",
+                    "last_hearing_date": "Unknown",
+                    "case_status": "Unknown",
+                    "victim_name": "Unknown",
+                    "suspect_name": "Unknown",
+                    "confidence": "low",
+                    "notes": "Batch analysis failed for this case.",
+                    "requires_manual_review": True
+                }
+            results.append({
+                "case_name": state["case_name"],
+                "search_attempts": state.get("search_attempts", 0),
+                "verdict": verdict,
+                "success": not verdict.get("requires_manual_review", False)
+            })
+
+    logger.info(f"✅ Batch research complete for {len(results)} cases")
+    return results
+
 
 
 if __name__ == "__main__":
@@ -465,7 +1201,7 @@ if __name__ == "__main__":
     result = research_case(case_name)
     
     print("\n📊 Final Result:")
-    print(json.dumps(result, indent=2, default=str))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode())
 
 def process_case(case_name, docket_url=None, case_id=None):
     return research_case(case_name, docket_url, case_id)
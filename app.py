@@ -1,45 +1,99 @@
+import logging
 import os
+import queue
+import csv
+import tempfile
+import uuid
 import threading
 import atexit
 import smtplib
-import html
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta, timezone
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 # Flask & Auth imports
-from flask import Flask, jsonify, request, render_template, session, redirect, url_for
+from flask import Flask, Response, g, jsonify, request, render_template, session, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_session import Session
+from cachelib import SimpleCache
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 from authlib.integrations.flask_client import OAuth
+from cachetools import TTLCache
+from jinja2 import FileSystemBytecodeCache
 
 # Internal modules
 import agent
+import orjson
 import pandas as pd
+import requests
 from db import (
-    init_db, get_all_cases, get_case_by_id, create_case, update_case, 
-    delete_case, get_cases_by_status, get_upcoming_hearings, get_supabase_client
+    init_db, get_all_cases, get_case_by_id, create_case, create_cases_bulk,
+    update_case, delete_case, get_cases_by_status,
+    get_due_cases, get_upcoming_hearings, get_supabase_client
 )
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.executors.pool import ThreadPoolExecutor as APSThreadPoolExecutor
+from apscheduler.triggers.cron import CronTrigger
 
 load_dotenv()
 
+# Lazy %-formatting via logging: with LOG_LEVEL=WARNING in production the
+# scheduler loop skips string formatting entirely instead of printing
+# through the stdout lock.
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 CORS(app)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify via orjson — large case lists serialize several times
+    faster than with the stdlib encoder."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = ORJSONProvider(app)
+
 # --- CONFIGURATION ---
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'super-secret-key-change-me')
+# Reject oversized uploads before any parsing; large-but-legal files
+# still go through the chunked import path, so this is purely a cap
+# against pathological requests
+app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024
 app.config['SESSION_COOKIE_NAME'] = 'google-login-session'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
+# Server-side sessions: the Google user_info dict used to ride inside a
+# signed cookie, costing a verify+deserialize per request and kilobytes
+# of header both ways. The cookie now carries only a session id and the
+# data lives in process memory with the same 7-day lifetime.
+app.config['SESSION_TYPE'] = 'cachelib'
+app.config['SESSION_CACHELIB'] = SimpleCache(
+    threshold=10000,
+    default_timeout=int(timedelta(days=7).total_seconds())
+)
+Session(app)
+
 # Email Config
 EMAIL_SENDER = os.getenv('EMAIL_SENDER')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
 EMAIL_RECIPIENT = os.getenv('EMAIL_RECIPIENT')
 SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
 SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+EMAIL_ENABLED = bool(EMAIL_SENDER and EMAIL_PASSWORD and EMAIL_RECIPIENT)
+
+# Status → accent color for email templates; default (Open) is blue.
+STATUS_COLORS = {'Closed': '#dc2626', 'Verdict Reached': '#059669'}
 
 # --- OAUTH SETUP ---
 oauth = OAuth(app)
@@ -56,31 +110,85 @@ os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
 # Semaphore for RAM protection
 research_semaphore = threading.Semaphore(4) 
-scheduler = BackgroundScheduler()
+
+# One shared pool for manually triggered research runs. A thread per
+# request could pile up unboundedly under burst clicks — everything
+# past the pool size just queues here instead of holding a live
+# thread blocked on research_semaphore.
+RESEARCH_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv('RESEARCH_WORKERS', '4')),
+    thread_name_prefix='research'
+)
+scheduler = BackgroundScheduler(
+    executors={'default': APSThreadPoolExecutor(20)},
+    job_defaults={'coalesce': True, 'max_instances': 1}
+)
 scheduler_started = False
 
+# Read-path cache for the dashboard GET endpoints: the same case lists
+# get re-fetched every few seconds by the UI, so serve repeats from
+# memory for 30s and clear on any write.
+_READ_CACHE = TTLCache(maxsize=256, ttl=30)
+_read_cache_lock = threading.Lock()
+
+
+def _cached_read(key, loader):
+    """Serve `loader()` results from the TTL cache under `key`."""
+    with _read_cache_lock:
+        if key in _READ_CACHE:
+            return _READ_CACHE[key]
+    value = loader()
+    with _read_cache_lock:
+        _READ_CACHE[key] = value
+    return value
+
+
+def _invalidate_read_cache():
+    """Drop all cached reads after any case write."""
+    with _read_cache_lock:
+        _READ_CACHE.clear()
+
 # --- AUTH DECORATOR ---
 from functools import wraps
 
-def login_required(f):
+# Each route knows statically whether it's an API or a page, so the
+# guards are split per kind instead of sniffing request.path on every
+# authenticated hit. session is already dict-like — no dict() copy.
+
+def api_login_required(f):
+    """Auth guard for /api routes: unauthenticated calls get 401 JSON."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user = dict(session).get('user', None)
+        user = session.get('user')
+        if not user:
+            return jsonify({"error": "Unauthorized"}), 401
+        # Handlers can read g.user without touching the session again
+        g.user = user
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def page_login_required(f):
+    """Auth guard for page routes: unauthenticated loads go to login."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user = session.get('user')
         if not user:
-            # If it's an API call, return 401
-            if request.path.startswith('/api/'):
-                return jsonify({"error": "Unauthorized"}), 401
-            # If it's a page load, redirect to login
             return redirect(url_for('login_page'))
+        g.user = user
         return f(*args, **kwargs)
     return decorated_function
 
+
+# Back-compat alias — every current use is an API route
+login_required = api_login_required
+
 # --- AUTH ROUTES ---
 
 @app.route('/login')
 def login_page():
     """Renders a simple login page."""
-    user = dict(session).get('user', None)
+    user = session.get('user')
     if user:
         return redirect('/')
     return render_template('login.html')
@@ -132,7 +240,7 @@ def logout():
     return redirect('/login')
 
 @app.route('/api/user')
-@login_required
+@api_login_required
 def get_user_info():
     """Returns current logged-in user info."""
     return jsonify(session.get('user'))
@@ -141,131 +249,56 @@ def get_user_info():
 # --- EXISTING APP ROUTES (With Protection) ---
 
 @app.route('/')
-@login_required  # <--- PROTECTED
+@page_login_required  # <--- PROTECTED
 def index():
     return render_template('index.html', user=session.get('user'))
 
-def send_email_alert(subject: str, body: str) -> bool:
-    """
-    Send an email alert using SMTP (Gmail).
-    """
-    if not all([EMAIL_SENDER, EMAIL_PASSWORD, EMAIL_RECIPIENT]):
-        print("⚠️ Email configuration incomplete. Skipping email alert.")
-        return False
-    
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_SENDER
-        msg['To'] = EMAIL_RECIPIENT
-        msg['Subject'] = subject
-        
-        msg.attach(MIMEText(body, 'html'))
-        
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-            server.send_message(msg)
-        
-        print(f"✅ Email sent: {subject}")
-        return True
-    
-    except Exception as e:
-        print(f"❌ Failed to send email: {e}")
-        return False
-
+# Email templates are compiled once at import instead of re-parsing an
+# f-string literal per send. The bytecode cache persists compiled
+# templates across restarts.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
-def send_case_status_alert(case: dict, new_status: str, verdict: dict):
-    """
-    Send an email alert when a case status changes to Closed or Verdict Reached.
-    """
-    # Escaping for security
-    safe_case_name = html.escape(case.get('case_name', 'Unknown'))
-    safe_status = html.escape(new_status)
-    safe_next_hearing = html.escape(str(verdict.get('next_hearing_date', 'N/A')))
-    safe_victim = html.escape(str(verdict.get('victim_name', 'N/A')))
-    safe_suspect = html.escape(str(verdict.get('suspect_name', 'N/A')))
-    safe_notes = html.escape(str(verdict.get('notes', 'N/A')))
-
-    subject = f"🚨 Case Alert: {safe_case_name} - {safe_status}"
-    
-    body = f"""
+CASE_ALERT_TMPL = app.jinja_env.from_string("""
     <html>
     <body style="font-family: Arial, sans-serif; padding: 20px;">
         <h2 style="color: #d32f2f;">Case Status Update</h2>
         <hr>
-        <h3>{safe_case_name}</h3>
+        <h3>{{ case_name }}</h3>
         <table style="border-collapse: collapse; width: 100%;">
             <tr>
                 <td style="padding: 8px; border: 1px solid #ddd;"><strong>New Status</strong></td>
-                <td style="padding: 8px; border: 1px solid #ddd;">{safe_status}</td>
+                <td style="padding: 8px; border: 1px solid #ddd;">{{ status }}</td>
             </tr>
             <tr>
                 <td style="padding: 8px; border: 1px solid #ddd;"><strong>Next Hearing Date</strong></td>
-                <td style="padding: 8px; border: 1px solid #ddd;">{safe_next_hearing}</td>
+                <td style="padding: 8px; border: 1px solid #ddd;">{{ next_hearing }}</td>
             </tr>
             <tr>
                 <td style="padding: 8px; border: 1px solid #ddd;"><strong>Victim</strong></td>
-                <td style="padding: 8px; border: 1px solid #ddd;">{safe_victim}</td>
+                <td style="padding: 8px; border: 1px solid #ddd;">{{ victim }}</td>
             </tr>
             <tr>
                 <td style="padding: 8px; border: 1px solid #ddd;"><strong>Suspect</strong></td>
-                <td style="padding: 8px; border: 1px solid #ddd;">{safe_suspect}</td>
+                <td style="padding: 8px; border: 1px solid #ddd;">{{ suspect }}</td>
             </tr>
             <tr>
                 <td style="padding: 8px; border: 1px solid #ddd;"><strong>Notes</strong></td>
-                <td style="padding: 8px; border: 1px solid #ddd;">{safe_notes}</td>
+                <td style="padding: 8px; border: 1px solid #ddd;">{{ notes }}</td>
             </tr>
         </table>
         <br>
         <p style="color: #666;">This is an automated alert from the Legal Case Tracking System.</p>
     </body>
     </html>
-    """
-    
-    send_email_alert(subject, body)
-
-def send_daily_summary_email(summary_report):
-    """
-    Sends a single email checking all updates from the daily run.
-    """
-    if not summary_report:
-        return
+    """)
 
-    count = len(summary_report)
-    subject = f"Daily Summary: {count} Cases Updated"
-    
-    rows_html = ""
-    for item in summary_report:
-        # Escape item fields
-        safe_case_name = html.escape(item.get('case_name', 'Unknown'))
-        safe_status = html.escape(item.get('status', 'Unknown'))
-        safe_next_hearing = html.escape(str(item.get('next_hearing', 'N/A')))
-        
-        # item['changes'] is a list of strings, likely generated by us. 
-        # But safely escaping them is good practice.
-        safe_changes = [html.escape(c) for c in item.get('changes', [])]
-        changes_str = "<br>".join([f"• {c}" for c in safe_changes])
-        
-        status_color = "#2563eb"
-        if item['status'] == 'Closed': status_color = "#dc2626"
-        if item['status'] == 'Verdict Reached': status_color = "#059669"
-        
-        rows_html += f"""
-        <tr style="border-bottom: 1px solid #eee;">
-            <td style="padding: 12px; font-weight: bold;">{safe_case_name}</td>
-            <td style="padding: 12px; color: {status_color}; text-transform: uppercase; font-size: 12px; font-weight: bold;">{safe_status}</td>
-            <td style="padding: 12px;">{changes_str}</td>
-            <td style="padding: 12px; color: #555;">{safe_next_hearing}</td>
-        </tr>
-        """
-
-    body = f"""
+DAILY_SUMMARY_TMPL = app.jinja_env.from_string("""
     <html>
     <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f9fafb;">
         <div style="max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; border: 1px solid #ddd;">
             <h2 style="color: #1a202c; border-bottom: 2px solid #3182ce; padding-bottom: 10px;">Daily Research Summary</h2>
             <p>The automated agent researched your active cases. Here are the updates:</p>
-            
+
             <table style="width: 100%; border-collapse: collapse; margin-top: 20px;">
                 <thead>
                     <tr style="background-color: #f7fafc; text-align: left;">
@@ -276,179 +309,469 @@ def send_daily_summary_email(summary_report):
                     </tr>
                 </thead>
                 <tbody>
-                    {rows_html}
+                    {% for item in items %}
+                    <tr style="border-bottom: 1px solid #eee;">
+                        <td style="padding: 12px; font-weight: bold;">{{ item.case_name }}</td>
+                        <td style="padding: 12px; color: {{ item.status_color }}; text-transform: uppercase; font-size: 12px; font-weight: bold;">{{ item.status }}</td>
+                        <td style="padding: 12px;">{% for change in item.changes %}• {{ change }}{% if not loop.last %}<br>{% endif %}{% endfor %}</td>
+                        <td style="padding: 12px; color: #555;">{{ item.next_hearing }}</td>
+                    </tr>
+                    {% endfor %}
                 </tbody>
             </table>
-            
+
             <p style="margin-top: 30px; font-size: 12px; color: #718096; text-align: center;">Generated by Legal Case Tracker AI</p>
         </div>
     </body>
     </html>
+    """)
+
+CASE_UPDATE_TMPL = app.jinja_env.from_string("""
+    <html>
+    <body style="font-family: 'Segoe UI', Arial, sans-serif; color: #333; line-height: 1.6; background-color: #f9fafb; padding: 20px;">
+
+        <div style="max-width: 600px; margin: 0 auto; background: #ffffff; border-radius: 8px; border: 1px solid #e5e7eb; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
+
+            <div style="background-color: #0f172a; padding: 20px; text-align: center;">
+                <h2 style="color: #ffffff; margin: 0; font-size: 20px;">Legal Case Update</h2>
+            </div>
+
+            <div style="padding: 30px;">
+
+                <h1 style="color: #1e293b; font-size: 24px; margin-top: 0; margin-bottom: 5px;">{{ case_name }}</h1>
+                <p style="color: #64748b; font-size: 14px; margin-top: 0;">Automated Report</p>
+
+                <table style="width: 100%; border-collapse: collapse; margin: 25px 0;">
+                    <tr>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b; width: 40%;"><strong>Status</strong></td>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; font-weight: bold; color: {{ status_color }};">
+                            {{ status }}
+                        </td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b;"><strong>Next Hearing</strong></td>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; font-weight: bold;">
+                            {{ next_date_display|safe }}
+                        </td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b;"><strong>Last Hearing</strong></td>
+                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9;">
+                            {{ last_date_display|safe }}
+                        </td>
+                    </tr>
+                </table>
+
+                <div style="background-color: #f8fafc; padding: 15px; border-radius: 6px; border-left: 4px solid {{ status_color }}; margin-bottom: 25px;">
+                    <strong style="color: #334155; display: block; margin-bottom: 10px;">Recent Changes:</strong>
+                    <ul style="margin: 0; padding-left: 20px; color: #475569;">
+                        {{ updates_html|safe }}
+                    </ul>
+                </div>
+
+                <div>
+                    <strong style="color: #334155;">AI Analysis:</strong>
+                    <p style="background-color: #fff; border: 1px solid #e2e8f0; padding: 15px; border-radius: 6px; color: #475569; margin-top: 8px;">
+                        {{ notes }}
+                    </p>
+                </div>
+
+            </div>
+
+            <div style="background-color: #f1f5f9; padding: 15px; text-align: center; font-size: 12px; color: #94a3b8;">
+                Generated by Legal Intelligence Dashboard • {{ generated_at }}
+            </div>
+        </div>
+    </body>
+    </html>
+    """)
+
+
+# Pooled SMTP connection: the TLS handshake + AUTH round trips dominate
+# each send, so keep one live connection per process and reconnect only
+# when Gmail drops it. The lock serializes sends (smtplib isn't
+# thread-safe) — still far cheaper than a handshake per email.
+_smtp_conn = None
+_smtp_lock = threading.Lock()
+
+
+def _get_smtp() -> smtplib.SMTP:
+    """Return a live, authenticated SMTP connection (reconnecting if stale)."""
+    global _smtp_conn
+
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.noop()
+            return _smtp_conn
+        except Exception:
+            try:
+                _smtp_conn.close()
+            except Exception:
+                pass
+            _smtp_conn = None
+
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.starttls()
+    server.login(EMAIL_SENDER, EMAIL_PASSWORD)
+    _smtp_conn = server
+    return _smtp_conn
+
+
+def _close_smtp():
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.quit()
+        except Exception:
+            pass
+        _smtp_conn = None
+
+
+atexit.register(_close_smtp)
+
+
+def send_email_alert(subject: str, body: str) -> bool:
+    """
+    Send an email alert using SMTP (Gmail) over the pooled connection.
     """
+    if not EMAIL_ENABLED:
+        logger.warning("⚠️ Email configuration incomplete. Skipping email alert.")
+        return False
+
+    try:
+        msg = MIMEMultipart()
+        msg['From'] = EMAIL_SENDER
+        msg['To'] = EMAIL_RECIPIENT
+        msg['Subject'] = subject
+
+        msg.attach(MIMEText(body, 'html'))
+
+        with _smtp_lock:
+            try:
+                _get_smtp().send_message(msg)
+            except smtplib.SMTPException:
+                # Connection died mid-send — rebuild once and retry
+                _close_smtp()
+                _get_smtp().send_message(msg)
+
+        logger.info("✅ Email sent: %s", subject)
+        return True
+
+    except Exception as e:
+        logger.error("❌ Failed to send email: %s", e)
+        return False
+
+
+# Email sends go through a background queue so callers (request handlers,
+# the scheduler loop, research threads) never block on SMTP latency;
+# the daemon worker drains it over the pooled connection.
+_mail_queue = queue.Queue()
+
+
+def _mail_worker():
+    while True:
+        subject, body = _mail_queue.get()
+        try:
+            send_email_alert(subject, body)
+        except Exception as e:
+            logger.error("❌ Mail worker error: %s", e)
+        finally:
+            _mail_queue.task_done()
+
+
+threading.Thread(target=_mail_worker, daemon=True, name="mail-worker").start()
+
+
+def queue_email_alert(subject: str, body: str):
+    """Hand an email off to the background sender (non-blocking)."""
+    _mail_queue.put_nowait((subject, body))
+
+
+def send_case_status_alert(case: dict, new_status: str, verdict: dict):
+    """
+    Send an email alert when a case status changes to Closed or Verdict Reached.
+    """
+    case_name = case.get('case_name', 'Unknown')
+    subject = f"🚨 Case Alert: {case_name} - {new_status}"
+
+    # Jinja autoescapes every value during render — no manual
+    # html.escape pass needed
+    body = CASE_ALERT_TMPL.render(
+        case_name=case_name,
+        status=new_status,
+        next_hearing=str(verdict.get('next_hearing_date', 'N/A')),
+        victim=str(verdict.get('victim_name', 'N/A')),
+        suspect=str(verdict.get('suspect_name', 'N/A')),
+        notes=str(verdict.get('notes', 'N/A')),
+    )
+
+    queue_email_alert(subject, body)
+
+def send_daily_summary_email(summary_report):
+    """
+    Sends a single email checking all updates from the daily run.
+    """
+    if not summary_report:
+        return
+
+    count = len(summary_report)
+    subject = f"Daily Summary: {count} Cases Updated"
     
-    send_email_alert(subject, body)
+    # summary_report holds CaseUpdate instances with colors precomputed
+    # and autoescape handling the text at render time — no per-item
+    # formatting work left here
+    body = DAILY_SUMMARY_TMPL.render(items=summary_report)
+
+    queue_email_alert(subject, body)
+
+@dataclass(slots=True)
+class CaseUpdate:
+    """One case's noteworthy outcome from a run, precomputed for the
+    summary email so the formatter does no per-item work."""
+    case_name: str
+    status: str
+    status_color: str
+    next_hearing: str
+    changes: list
+    notes: str
+
+
+def _compute_update(case: dict, verdict: dict, now_iso: str = None):
+    """
+    Derive the DB patch, change list and alert payload from a finished
+    agent verdict. Pure function — every update path writes exactly
+    what this returns, so there is a single maintained write shape and
+    one UPDATE per case per run. The daily sweep passes its tick
+    timestamp as now_iso so one run stamps all its cases identically.
+
+    Returns:
+        tuple: (update_data, changes, alert_data). alert_data is None
+        when nothing noteworthy changed.
+    """
+    old_status = case.get('status', 'Open')
+    old_next_date = case.get('next_hearing_date')
+
+    # Bind verdict fields once instead of repeated dict lookups below
+    new_status = verdict.get('case_status', 'Unknown')
+    new_next_date = verdict.get('next_hearing_date')
+    victim_name = verdict.get('victim_name')
+    suspect_name = verdict.get('suspect_name')
+    last_hearing = verdict.get('last_hearing_date')
+
+    changes = []
+
+    if new_status not in ['Unknown', 'Pending'] and new_status != old_status:
+        changes.append(f"Status: {old_status} -> {new_status}")
+
+    if new_next_date and new_next_date != 'Unknown' and new_next_date != old_next_date:
+        changes.append(f"Next Hearing: {new_next_date}")
+
+    def clean_val(v): return None if not v or str(v).lower() == 'unknown' else v
+
+    if now_iso is None:
+        now_iso = datetime.now(timezone.utc).isoformat()
+    update_data = {
+        'last_checked_date': now_iso,
+        'updated_at': now_iso,
+        'notes': verdict.get('notes', ''),
+        'confidence': verdict.get('confidence', 'high')
+    }
+
+    if new_next_date and new_next_date != 'Unknown':
+        update_data['next_hearing_date'] = new_next_date
+
+    if clean_val(victim_name):
+        update_data['victim_name'] = victim_name
+
+    if clean_val(suspect_name):
+        update_data['suspect_name'] = suspect_name
+
+    if new_status not in ['Unknown', 'Pending']:
+        update_data['status'] = new_status
+
+    if clean_val(last_hearing):
+        update_data['last_hearing_date'] = last_hearing
+
+    alert_data = None
+    if changes or new_status in ['Closed', 'Verdict Reached']:
+        status = update_data.get('status', old_status)
+        alert_data = CaseUpdate(
+            case_name=case.get('case_name', 'Unknown'),
+            status=status,
+            status_color=STATUS_COLORS.get(status, "#2563eb"),
+            next_hearing=update_data.get('next_hearing_date', 'N/A'),
+            changes=changes,
+            notes=update_data.get('notes', '')
+        )
+
+    return update_data, changes, alert_data
+
 
-def process_case_update(case: dict, return_alert_only=False) -> dict:
-    """Run the research agent for a case and update the database."""
+def _probe_docket(case: dict):
+    """
+    Cheap conditional HEAD against the docket page.
+
+    Sends the ETag/Last-Modified validators stored on the case so an
+    unchanged docket costs one HTTP round trip instead of a full agent
+    run. Any error (timeout, no validators, server ignores conditionals)
+    falls through to "changed" so a flaky docket site never blocks a run.
+
+    Returns:
+        tuple: (unchanged, validators). unchanged is True when the
+        docket provably hasn't changed; validators holds fresh
+        docket_etag/docket_last_modified values to store, if any.
+    """
+    docket_url = case.get('docket_url')
+    if not docket_url:
+        return False, {}
+
+    etag = case.get('docket_etag')
+    last_modified = case.get('docket_last_modified')
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = requests.head(docket_url, headers=headers, timeout=5, allow_redirects=True)
+    except requests.RequestException as e:
+        logger.warning("⚠️ Docket HEAD failed for %s: %s", docket_url, e)
+        return False, {}
+
+    if response.status_code == 304:
+        return True, {}
+
+    new_etag = response.headers.get('ETag')
+    new_last_modified = response.headers.get('Last-Modified')
+
+    # Some servers ignore conditional headers on HEAD and answer 200
+    # anyway — identical validators still mean nothing changed.
+    if response.ok and (etag or last_modified) \
+            and (not etag or new_etag == etag) \
+            and (not last_modified or new_last_modified == last_modified):
+        return True, {}
+
+    validators = {}
+    if new_etag:
+        validators['docket_etag'] = new_etag
+    if new_last_modified:
+        validators['docket_last_modified'] = new_last_modified
+    return False, validators
+
+
+def process_case_update(case: dict, extra_update: dict = None, now_iso: str = None):
+    """
+    Run the research agent for a case and update the database.
+
+    extra_update fields (e.g. fresh docket validators from a HEAD probe)
+    ride along in the same UPDATE so no extra round trip is spent.
+
+    Returns the alert payload for the daily summary, or None when the
+    run produced nothing noteworthy (or failed).
+    """
     case_id = case['id']
     case_name = case['case_name']
     docket_url = case.get('docket_url')
-    old_status = case.get('status', 'Open')
-    old_next_date = case.get('next_hearing_date')
 
-    print(f"🔄 Processing case {case_id}: {case_name}")
+    logger.info("🔄 Processing case %s: %s", case_id, case_name)
     
     try:
         result = agent.process_case(case_name, docket_url=docket_url, case_id=case_id)
         verdict = result.get('verdict', {})
-        
-        changes = []
-        
-        new_status = verdict.get('case_status', 'Unknown')
-        if new_status not in ['Unknown', 'Pending'] and new_status != old_status:
-            changes.append(f"Status: {old_status} -> {new_status}")
-            
-        new_next_date = verdict.get('next_hearing_date')
-        if new_next_date and new_next_date != 'Unknown' and new_next_date != old_next_date:
-            changes.append(f"Next Hearing: {new_next_date}")
-            
-        def clean_val(v): return None if not v or str(v).lower() == 'unknown' else v
-        
-        update_data = {
-            'last_checked_date': datetime.now(timezone.utc).isoformat(),
-            'notes': verdict.get('notes', ''),
-            'confidence': verdict.get('confidence', 'high')
-        }
-        
-        if new_next_date and new_next_date != 'Unknown':
-            update_data['next_hearing_date'] = new_next_date
-            
-        if clean_val(verdict.get('victim_name')):
-            update_data['victim_name'] = verdict.get('victim_name')
-            
-        if clean_val(verdict.get('suspect_name')):
-            update_data['suspect_name'] = verdict.get('suspect_name')
-
-        if new_status not in ['Unknown', 'Pending']:
-            update_data['status'] = new_status
-
-        if clean_val(verdict.get('last_hearing_date')):
-            update_data['last_hearing_date'] = verdict.get('last_hearing_date')
-
-        update_case(case_id, update_data)
-        print(f"✅ Case {case_id} updated successfully")
-
-        alert_data = None
-        if changes or new_status in ['Closed', 'Verdict Reached']:
-             alert_data = {
-                 'case_name': case_name,
-                 'status': update_data.get('status', old_status),
-                 'changes': changes,
-                 'next_hearing': update_data.get('next_hearing_date', 'N/A'),
-                 'notes': update_data.get('notes', '')
-             }
-
-        if return_alert_only:
-            return alert_data
-        else:
-            if alert_data and (new_status in ['Closed', 'Verdict Reached'] and old_status != new_status):
-                send_case_status_alert(case, new_status, verdict)
-            return result
+
+        update_data, changes, alert_data = _compute_update(case, verdict, now_iso=now_iso)
+
+        if extra_update:
+            try:
+                update_case(case_id, {**update_data, **extra_update})
+                update_data = None
+            except Exception:
+                # Deployments predating the docket validator columns
+                # reject them — save the regular fields on their own
+                pass
+        if update_data is not None:
+            update_case(case_id, update_data)
+        _invalidate_read_cache()
+        logger.info("✅ Case %s updated successfully", case_id)
+
+        return alert_data
     
     except Exception as e:
-        print(f"❌ Error processing case {case_id}: {e}")
-        return {'error': str(e)}
+        logger.error("❌ Error processing case %s: %s", case_id, e)
+        return None
 
 def scheduled_case_check():
     """
     Background job that runs every 24 hours to check and update cases.
     BATCHES emails into one daily summary.
     """
-    print("\n" + "=" * 60)
-    print("🕐 Running scheduled case check...")
-    print(f"   Time: {datetime.now().isoformat()}")
-    print("=" * 60 + "\n")
-    
+    # One clock reading stamps the whole tick — every case processed in
+    # this run shares the same last_checked_date instead of paying a
+    # syscall + tz conversion apiece.
+    run_started_iso = datetime.now(timezone.utc).isoformat()
+    logger.info("🕐 Running scheduled case check at %s", run_started_iso)
+
     summary_report = []
 
     try:
-        open_cases = get_cases_by_status('Open')
-        pending_cases = get_cases_by_status('Pending')
-        all_cases = open_cases + pending_cases
-        
-        if not all_cases:
-            print("No open or pending cases to check.")
+        # Eligibility is decided in Postgres (see get_due_cases), so only
+        # the cases that actually need a run cross the wire. Rules are
+        # unchanged:
+        #   - only Open/Pending cases are considered
+        #   - no hearing date -> run
+        #   - hearing overdue or within 7 days -> run
+        #   - hearing within 30 days -> run if not checked in the last 3 days
+        #   - hearing beyond 30 days -> skip
+        eligible_cases = get_due_cases()
+
+        if not eligible_cases:
+            logger.info("No cases due for a check.")
             return
-        
-        today = date.today()
-        cases_processed = 0
-        cases_skipped = 0
-        
-        for case in all_cases:
-            case_name = case.get('case_name', 'Unknown')
-            next_hearing = case.get('next_hearing_date')
-            status = case.get('status', 'Open')
-            
-            if status == 'Closed':
-                cases_skipped += 1
-                continue
-            
-            should_run = False
-            if next_hearing is None:
-                should_run = True
-            else:
-                try:
-                    if isinstance(next_hearing, str):
-                        try:
-                            hearing_date = datetime.strptime(next_hearing, "%Y-%m-%d").date()
-                        except ValueError:
-                            import dateutil.parser
-                            hearing_date = dateutil.parser.parse(next_hearing).date()
-                    else:
-                        hearing_date = next_hearing
-                    
-                    days_until_hearing = (hearing_date - today).days
-                    
-                    if days_until_hearing < 0 or days_until_hearing <= 7:
-                        should_run = True
-                    elif 7 < days_until_hearing <= 30:
-                        # Check "Middle Distance" cases if not checked in the last 3 days
-                        last_checked_str = case.get('last_checked_date')
-                        if last_checked_str:
-                            try:
-                                last_checked = datetime.fromisoformat(last_checked_str).date()
-                                if (today - last_checked).days >= 3:
-                                    should_run = True
-                            except:
-                                should_run = True
-                        else:
-                            should_run = True
-                    elif days_until_hearing > 30:
-                        should_run = False
-                except Exception:
-                    should_run = True
-            
-            if should_run:
-                print(f"🔍 Running agent for: {case_name}")
-                alert_data = process_case_update(case, return_alert_only=True)
-                
+
+        cases_processed = len(eligible_cases)
+
+        for case in eligible_cases:
+            logger.info("🔍 Queueing agent run for: %s", case.get('case_name', 'Unknown'))
+
+        # The per-case work is IO-bound (research agent + Supabase write),
+        # so run the eligible cases through a thread pool instead of
+        # serially. Each worker takes research_semaphore so the sweep
+        # shares the same RAM-protection cap as manually triggered runs;
+        # the pool size matches the semaphore so no thread sits blocked.
+        # Cases whose hearing sits beyond the 7-day horizon only run
+        # because they're stale; for those a conditional HEAD on the
+        # docket can prove nothing changed and skip the agent entirely.
+        soon = (date.today() + timedelta(days=7)).isoformat()
+
+        def _guarded_process(c):
+            with research_semaphore:
+                validators = {}
+                next_hearing = c.get('next_hearing_date')
+                if next_hearing and next_hearing > soon:
+                    unchanged, validators = _probe_docket(c)
+                    if unchanged:
+                        logger.info("💤 Docket unchanged for %s — skipping agent run", c.get('case_name', 'Unknown'))
+                        update_case(c['id'], {'last_checked_date': run_started_iso})
+                        _invalidate_read_cache()
+                        return None
+                return process_case_update(c, extra_update=validators or None, now_iso=run_started_iso)
+
+        if eligible_cases:
+            for alert_data in RESEARCH_POOL.map(_guarded_process, eligible_cases):
                 if alert_data:
                     summary_report.append(alert_data)
-                    
-                cases_processed += 1
-            else:
-                cases_skipped += 1
-        
+
         if summary_report:
-            print(f"📧 Sending Daily Summary for {len(summary_report)} cases...")
+            logger.info("📧 Sending Daily Summary for %d cases...", len(summary_report))
             send_daily_summary_email(summary_report)
         else:
-            print("💤 No significant updates found. No email sent.")
+            logger.info("💤 No significant updates found. No email sent.")
 
-        print(f"\n📊 Scheduled check complete: {cases_processed} processed, {cases_skipped} skipped")
+        logger.info("📊 Scheduled check complete: %d cases processed", cases_processed)
     
     except Exception as e:
-        print(f"❌ Scheduled job error: {e}")
+        logger.error("❌ Scheduled job error: %s", e)
 
 def start_scheduler():
     """Start the background scheduler."""
@@ -457,17 +780,26 @@ def start_scheduler():
     if scheduler_started:
         return
     
+    # Cron instead of a 24h interval: the run lands at a fixed wall-clock
+    # hour rather than drifting with process restarts. The check can
+    # overrun when the agent is slow; coalesce collapses queued misfires
+    # into one run and max_instances stops overlapping sweeps from
+    # hammering Supabase concurrently.
     scheduler.add_job(
         func=scheduled_case_check,
-        trigger=IntervalTrigger(hours=24),
+        trigger=CronTrigger(hour=int(os.getenv('DAILY_HOUR_UTC', '2'))),
         id='daily_case_check',
         name='Daily Case Status Check',
-        replace_existing=True
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=3600
     )
     
     scheduler.start()
     scheduler_started = True
-    print("✅ Background scheduler started (running every 24 hours)")
+    logger.info("✅ Background scheduler started (daily run at %s:00)",
+                os.getenv('DAILY_HOUR_UTC', '2'))
     
     atexit.register(lambda: scheduler.shutdown())
 
@@ -481,7 +813,7 @@ def health_check():
 
 
 @app.route('/api/cases', methods=['GET'])
-@login_required 
+@api_login_required 
 def list_cases():
     """
     List all cases with optional status filtering.
@@ -489,16 +821,18 @@ def list_cases():
     status = request.args.get('status')
     
     try:
-        if status:
-            cases = get_cases_by_status(status)
-        else:
-            cases = get_all_cases()
-        
-        return jsonify({
+        cases = _cached_read(
+            ("cases", status or "__all__"),
+            lambda: get_cases_by_status(status) if status else get_all_cases()
+        )
+
+        response = jsonify({
             "success": True,
             "data": cases,
             "count": len(cases)
         })
+        response.headers['Cache-Control'] = 'max-age=30, stale-while-revalidate=60'
+        return response
     except Exception as e:
         return jsonify({
             "success": False,
@@ -507,12 +841,12 @@ def list_cases():
 
 
 @app.route('/api/cases/<int:case_id>', methods=['GET'])
-@login_required
+@api_login_required
 def get_case(case_id):
     """Get a specific case by ID."""
     try:
-        case = get_case_by_id(case_id)
-        
+        case = _cached_read(("case", case_id), lambda: get_case_by_id(case_id))
+
         if case:
             return jsonify({
                 "success": True,
@@ -530,14 +864,37 @@ def get_case(case_id):
         }), 500
 
 def clean_date_input(date_str):
-    """Converts 'Unknown', empty strings, or None to Python None (SQL NULL)."""
-    if not date_str or str(date_str).strip().lower() in ['unknown', 'none', 'n/a', '']:
+    """
+    Converts 'Unknown', empty strings, or None to Python None (SQL NULL).
+    Anything else must be a valid ISO date — rejecting garbage here keeps
+    the DATE column clean, so downstream consumers can use
+    date.fromisoformat without fallbacks.
+    """
+    if not date_str or str(date_str).strip().lower() in _NULL_DATE_SENTINELS:
+        return None
+    value = str(date_str).strip()
+    try:
+        date.fromisoformat(value[:10])
+    except ValueError:
         return None
-    return date_str
+    return value
+
+
+# Sentinels that mean "no date" — a frozenset so membership is one hash
+# lookup instead of rebuilding a list per call
+_NULL_DATE_SENTINELS = frozenset({'unknown', 'none', 'n/a', ''})
+
+# Writable case fields for PUT /api/cases/<id>, with per-field
+# normalizers, built once instead of a list + if-chain per request
+ALLOWED_FIELDS = frozenset({
+    'case_name', 'docket_url', 'victim_name', 'suspect_name',
+    'next_hearing_date', 'status', 'notes', 'last_checked_date'
+})
+FIELD_NORMALIZERS = {'next_hearing_date': clean_date_input}
 
 @app.route('/api/add_case', methods=['POST'])
 @app.route('/api/cases', methods=['POST'])
-@login_required 
+@api_login_required 
 def add_case():
     """
     Create a new case with 'Pending' status.
@@ -558,11 +915,12 @@ def add_case():
             "suspect_name": data.get('suspect_name'),
             "next_hearing_date": clean_date_input(data.get('next_hearing_date')),
             "status": "Pending",  # Always start as Pending
-            "notes": data.get('notes', 'Case added, awaiting research.'),
-            "last_checked_date": datetime.utcnow().isoformat()
+            "notes": data.get('notes', 'Case added, awaiting research.')
+            # last_checked_date comes from the column's DEFAULT NOW()
         }
         
         new_case = create_case(case_data)
+        _invalidate_read_cache()
         
         return jsonify({
             "success": True,
@@ -577,7 +935,7 @@ def add_case():
 
 
 @app.route('/api/cases/<int:case_id>', methods=['PUT'])
-@login_required
+@api_login_required
 def modify_case(case_id):
     """Update an existing case."""
     try:
@@ -589,19 +947,15 @@ def modify_case(case_id):
                 "error": "No data provided"
             }), 400
         
-        update_data = {}
-        allowed_fields = ['case_name', 'docket_url', 'victim_name', 'suspect_name', 
-                         'next_hearing_date', 'status', 'notes', 'last_checked_date']
-        
-        for field in allowed_fields:
-            if field in data:
-                if field == 'next_hearing_date':
-                    update_data[field] = clean_date_input(data[field])
-                else:
-                    update_data[field] = data[field]
-        
+        update_data = {
+            field: FIELD_NORMALIZERS[field](value) if field in FIELD_NORMALIZERS else value
+            for field, value in data.items()
+            if field in ALLOWED_FIELDS
+        }
+
         updated_case = update_case(case_id, update_data)
-        
+        _invalidate_read_cache()
+
         if updated_case:
             return jsonify({
                 "success": True,
@@ -621,11 +975,12 @@ def modify_case(case_id):
 
 
 @app.route('/api/cases/<int:case_id>', methods=['DELETE'])
-@login_required
+@api_login_required
 def remove_case(case_id):
     """Delete a case."""
     try:
         delete_case(case_id)
+        _invalidate_read_cache()
         return jsonify({
             "success": True,
             "message": "Case deleted successfully"
@@ -637,38 +992,95 @@ def remove_case(case_id):
         }), 500
 
 
-from agent import PROGRESS
+from agent import get_progress_snapshot, subscribe_progress, unsubscribe_progress
+
+# The frontend polls progress every second or two per open case; when
+# the in-memory PROGRESS map misses, cache the DB-derived answer
+# briefly so each poll doesn't cost a Supabase round trip.
+_PROGRESS_DB_CACHE = TTLCache(maxsize=1024, ttl=2)
+_progress_db_cache_lock = threading.Lock()
+
+
+def _invalidate_progress_cache(case_id):
+    with _progress_db_cache_lock:
+        _PROGRESS_DB_CACHE.pop(case_id, None)
+
 
 @app.route('/api/progress/<int:case_id>', methods=['GET'])
-@login_required
+@api_login_required
 def get_progress(case_id):
     """
     Get the real-time progress of a case research.
-    checks Memory first (fastest), then DB (persistence).
+    Checks memory first (fastest), then a short-TTL cache, then DB.
     """
-    progress = PROGRESS.get(case_id)
+    progress = get_progress_snapshot(case_id)
     if progress:
         return jsonify(progress)
-    
+
+    with _progress_db_cache_lock:
+        cached = _PROGRESS_DB_CACHE.get(case_id)
+    if cached is not None:
+        return jsonify(cached)
+
+    payload = {"status": "idle", "percent": 0, "message": "Waiting..."}
     try:
-        case = get_case_by_id(case_id)
+        # Three small columns instead of the whole row (the notes blob
+        # dwarfs everything else) — this endpoint gets polled
+        case = get_case_by_id(case_id, cols="id,processing_status,progress_percent,progress_message")
         if case and case.get('processing_status') == 'processing':
-            return jsonify({
+            payload = {
                  "status": case.get('processing_status'),
                  "percent": case.get('progress_percent', 0),
                  "message": case.get('progress_message', 'Resuming...')
-            })
+            }
         elif case and case.get('processing_status') == 'complete':
-             return jsonify({
+            payload = {
                  "status": "complete",
                  "percent": 100,
                  "message": "Complete"
-            })
-            
+            }
     except Exception as e:
-        print(f"⚠️ DB Progress fetch failed: {e}")
+        logger.warning("⚠️ DB Progress fetch failed: %s", e)
+
+    with _progress_db_cache_lock:
+        _PROGRESS_DB_CACHE[case_id] = payload
+    return jsonify(payload)
 
-    return jsonify({"status": "idle", "percent": 0, "message": "Waiting..."})
+
+@app.route('/api/progress/<int:case_id>/stream', methods=['GET'])
+@api_login_required
+def stream_progress(case_id):
+    """
+    Server-Sent Events stream of research progress for a case.
+    Events are pushed by the agent as they happen, so streaming clients
+    cost nothing between steps — no per-second polling round trips.
+    The polling endpoint above remains as a fallback for clients
+    without EventSource support.
+    """
+    def generate():
+        listener = subscribe_progress(case_id)
+        try:
+            # Replay the current state first so late subscribers sync up
+            current = get_progress_snapshot(case_id)
+            if current:
+                yield f"data: {orjson.dumps(current).decode()}\n\n"
+                if current.get("status") == "complete":
+                    return
+            while True:
+                try:
+                    event = listener.get(timeout=30)
+                except queue.Empty:
+                    # Comment line keeps proxies from dropping the socket
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {orjson.dumps(event).decode()}\n\n"
+                if event.get("status") == "complete":
+                    return
+        finally:
+            unsubscribe_progress(case_id, listener)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 def run_case_background_update(case_id):
@@ -679,27 +1091,24 @@ def run_case_background_update(case_id):
         # Create a new app context since we are in a thread
         with app.app_context():
             try:
-                # ✅ FIX: Thread-Safety (Shared Brain Risk)
-                # Create a fresh client connection for this thread
-                from db import SUPABASE_URL, SUPABASE_KEY
-                from supabase import create_client
-                thread_safe_supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-                
-                print(f"🔄 Starting background update for Case ID: {case_id}")
-                
-                thread_safe_supabase.table("cases").update({
+                logger.info("🔄 Starting background update for Case ID: %s", case_id)
+
+                # The shared client's httpx session is thread-safe, so this
+                # thread goes through the same db helpers as every other
+                # write path instead of building its own client per run.
+                # PostgREST returns the patched row (return=representation),
+                # so the update doubles as the case fetch — one round trip
+                # instead of PATCH + SELECT before work starts.
+                case = update_case(case_id, {
                     "processing_status": "processing",
                     "progress_percent": 0,
                     "progress_message": "Starting research..."
-                }).eq("id", case_id).execute()
-
-                result = thread_safe_supabase.table("cases").select("*").eq("id", case_id).execute()
+                })
+                _invalidate_progress_cache(case_id)
 
-                if not result.data:
-                    print(f"❌ Case {case_id} not found in background job.")
+                if not case:
+                    logger.error("❌ Case %s not found in background job.", case_id)
                     return
-                
-                case = result.data[0]
                 old_case = case.copy()
                 is_first_run = case.get('last_hearing_date') is None and case.get('next_hearing_date') is None
 
@@ -708,132 +1117,69 @@ def run_case_background_update(case_id):
 
                 updated_info = agent.process_case(case_name, docket_url=docket_url, case_id=case_id)
 
-                changes_detected = []
-                
-                if is_first_run:
-                    changes_detected.append("🚀 Initial Research Complete (First Run)")
-
-                new_next_date = updated_info.get('verdict', {}).get('next_hearing_date')
-                old_next_date = old_case.get('next_hearing_date')
-                
-                if new_next_date != old_next_date:
-                    changes_detected.append(f"📅 Next Hearing: {new_next_date}")
-
-                new_status = updated_info.get('verdict', {}).get('case_status', 'Open')
-                if new_status != old_case.get('status'):
-                    changes_detected.append(f"⚖️ Status Update: {new_status}")
-
+                # Same compute helper as the scheduled sweep: one write
+                # shape, and a partial verdict no longer clobbers stored
+                # fields with NULLs
                 verdict = updated_info.get('verdict', {})
+                update_data, changes_detected, _alert = _compute_update(old_case, verdict)
 
-                def clean_date_for_db(date_str):
-                    """Converts 'Unknown', empty strings, or None to Python None (SQL NULL)."""
-                    if not date_str or str(date_str).lower() == 'unknown':
-                        return None
-                    return date_str
-
-                data_to_save = {
-                    "status": new_status,
-                    "next_hearing_date": clean_date_for_db(verdict.get('next_hearing_date')),
-                    "last_hearing_date": clean_date_for_db(verdict.get('last_hearing_date')),
-                    "victim_name": verdict.get('victim_name'),
-                    "suspect_name": verdict.get('suspect_name'),
-                    "notes": verdict.get('notes'), 
-                    "confidence": verdict.get('confidence', 'high'),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                thread_safe_supabase.table("cases").update(data_to_save).eq("id", case_id).execute()
+                if is_first_run:
+                    changes_detected.insert(0, "🚀 Initial Research Complete (First Run)")
+
+                # Terminal progress fields ride in the same PATCH as the
+                # research results, so the done-state is written exactly
+                # once instead of racing a separate progress flush
+                update_data.update({
+                    "processing_status": "complete",
+                    "progress_percent": 100,
+                    "progress_message": "Research Complete!"
+                })
+                update_case(case_id, update_data)
+                _invalidate_read_cache()
+                _invalidate_progress_cache(case_id)
 
                 if changes_detected:
-                    print(f"📧 Sending email for: {case_name}")
+                    logger.info("📧 Sending email for: %s", case_name)
                     
                     email_subject = f"⚖️ Update: {case_name}"
                     if is_first_run:
                         email_subject = f"🆕 New Case Analyzed: {case_name}"
 
                     updates_html = "".join([f"<li style='margin-bottom: 5px;'>{c}</li>" for c in changes_detected])
+
+                    display_status = update_data.get('status', old_case.get('status', 'Open'))
+                    next_hearing = update_data.get('next_hearing_date') or old_case.get('next_hearing_date')
+                    last_hearing = update_data.get('last_hearing_date') or old_case.get('last_hearing_date')
+                    next_date_display = next_hearing if next_hearing else '<span style="color:#999; font-style:italic;">None</span>'
+                    last_date_display = last_hearing if last_hearing else '<span style="color:#999; font-style:italic;">Unknown</span>'
                     
-                    next_date_display = data_to_save['next_hearing_date'] if data_to_save['next_hearing_date'] else '<span style="color:#999; font-style:italic;">None</span>'
-                    last_date_display = data_to_save['last_hearing_date'] if data_to_save['last_hearing_date'] else '<span style="color:#999; font-style:italic;">Unknown</span>'
-                    
-                    status_color = "#2563eb" # Blue for Open
-                    if data_to_save['status'] == 'Closed': status_color = "#dc2626" # Red
-                    if data_to_save['status'] == 'Verdict Reached': status_color = "#059669" # Green
-
-                    email_body = f"""
-                    <html>
-                    <body style="font-family: 'Segoe UI', Arial, sans-serif; color: #333; line-height: 1.6; background-color: #f9fafb; padding: 20px;">
-                        
-                        <div style="max-width: 600px; margin: 0 auto; background: #ffffff; border-radius: 8px; border: 1px solid #e5e7eb; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-                            
-                            <div style="background-color: #0f172a; padding: 20px; text-align: center;">
-                                <h2 style="color: #ffffff; margin: 0; font-size: 20px;">Legal Case Update</h2>
-                            </div>
-
-                            <div style="padding: 30px;">
-                                
-                                <h1 style="color: #1e293b; font-size: 24px; margin-top: 0; margin-bottom: 5px;">{case_name}</h1>
-                                <p style="color: #64748b; font-size: 14px; margin-top: 0;">Automated Report</p>
-
-                                <table style="width: 100%; border-collapse: collapse; margin: 25px 0;">
-                                    <tr>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b; width: 40%;"><strong>Status</strong></td>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; font-weight: bold; color: {status_color};">
-                                            {data_to_save['status']}
-                                        </td>
-                                    </tr>
-                                    <tr>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b;"><strong>Next Hearing</strong></td>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; font-weight: bold;">
-                                            {next_date_display}
-                                        </td>
-                                    </tr>
-                                    <tr>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9; color: #64748b;"><strong>Last Hearing</strong></td>
-                                        <td style="padding: 10px 0; border-bottom: 1px solid #f1f5f9;">
-                                            {last_date_display}
-                                        </td>
-                                    </tr>
-                                </table>
-
-                                <div style="background-color: #f8fafc; padding: 15px; border-radius: 6px; border-left: 4px solid {status_color}; margin-bottom: 25px;">
-                                    <strong style="color: #334155; display: block; margin-bottom: 10px;">Recent Changes:</strong>
-                                    <ul style="margin: 0; padding-left: 20px; color: #475569;">
-                                        {updates_html}
-                                    </ul>
-                                </div>
-
-                                <div>
-                                    <strong style="color: #334155;">AI Analysis:</strong>
-                                    <p style="background-color: #fff; border: 1px solid #e2e8f0; padding: 15px; border-radius: 6px; color: #475569; margin-top: 8px;">
-                                        {data_to_save['notes']}
-                                    </p>
-                                </div>
-
-                            </div>
-                            
-                            <div style="background-color: #f1f5f9; padding: 15px; text-align: center; font-size: 12px; color: #94a3b8;">
-                                Generated by Legal Intelligence Dashboard • {datetime.now().strftime("%Y-%m-%d %H:%M")}
-                            </div>
-                        </div>
-                    </body>
-                    </html>
-                    """
+                    status_color = STATUS_COLORS.get(display_status, "#2563eb")
+
+                    email_body = CASE_UPDATE_TMPL.render(
+                        case_name=case_name,
+                        status=display_status,
+                        status_color=status_color,
+                        next_date_display=next_date_display,
+                        last_date_display=last_date_display,
+                        updates_html=updates_html,
+                        notes=update_data.get('notes', ''),
+                        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M"),
+                    )
                     
                     try:
-                        send_email_alert(email_subject, email_body)
+                        queue_email_alert(email_subject, email_body)
                     except Exception as e:
-                        print(f"⚠️ Email failed: {e}")
+                        logger.warning("⚠️ Email failed: %s", e)
                 else:
-                    print("💤 No changes found. No email sent.")
+                    logger.info("💤 No changes found. No email sent.")
 
             except Exception as e:
-                print(f"❌ Background Process Error: {e}")
+                logger.error("❌ Background Process Error: %s", e)
 
 
 @app.route('/api/trigger_update', methods=['POST'])
 @app.route('/api/trigger_update/<int:case_id>', methods=['POST'])
-@login_required 
+@api_login_required 
 def trigger_update(case_id=None):
     """
     Triggers AI Research (Async).
@@ -847,55 +1193,65 @@ def trigger_update(case_id=None):
                  return jsonify({"error": "case_id is required"}), 400
              case_id = data['case_id']
 
-        # Get current status to prevent redundant runs
-        result = supabase.table("cases").select("*").eq("id", case_id).execute()
+        # Get current status to prevent redundant runs. Only project the
+        # columns this check reads — select("*") dragged the notes blob
+        # and progress fields over the wire just to look at two values.
+        result = supabase.table("cases").select(
+            "id,case_name,docket_url,processing_status,last_checked_date"
+        ).eq("id", case_id).execute()
         if not result.data:
             return jsonify({"error": "Case not found"}), 404
         
         case = result.data[0]
 
-        status = case.get('processing_status')
-        if status in ['processing', 'queued']:
-             # ✅ FIX: Check if it's a "Zombie" (stuck for > 1 hour)
-             last_checked = case.get('last_checked_date')
-             is_stuck = False
-             if last_checked:
-                 try:
-                     last_time = datetime.fromisoformat(last_checked.replace('Z', '+00:00'))
-                     if datetime.now(timezone.utc) - last_time > timedelta(hours=1):
-                         is_stuck = True
-                 except:
-                     pass # Date parse error, ignore
-
-             if not is_stuck:
-                 return jsonify({
-                     "success": False, 
-                     "error": f"Case is already {status}! Please wait."
-                 }), 429
-             else:
-                 print(f"⚠️ Detected ZOMBIE case {case_id}. Forcing unlock.")
-        
-        # Mark as queued IMMEDIATELY
-        supabase.table("cases").update({
+        # ?refresh=1 bypasses the day-level caches: the cached verdict
+        # and docket scrape are dropped so this run hits the sources
+        if request.args.get('refresh') == '1':
+            agent.invalidate_case_cache(case['case_name'], case.get('docket_url'))
+
+        # Claim the case atomically: the UPDATE only matches when the
+        # case isn't already in flight — or when it is but stale for
+        # over an hour (a "Zombie" left behind by a crashed run). Two
+        # near-simultaneous clicks can both pass a read-then-write
+        # check; here the database picks exactly one winner. The claim
+        # stamps last_checked_date in the same UPDATE: without that, a
+        # case whose last run was over an hour ago would still match
+        # the zombie disjunct for the second click and dispatch twice.
+        claim_time = datetime.now(timezone.utc)
+        zombie_before = (claim_time - timedelta(hours=1)).isoformat()
+        claim = supabase.table("cases").update({
             "processing_status": "queued",
             "progress_percent": 0,
-            "progress_message": "Waiting in queue..."
-        }).eq("id", case_id).execute()
+            "progress_message": "Waiting in queue...",
+            "last_checked_date": claim_time.isoformat()
+        }).eq("id", case_id).or_(
+            f"processing_status.not.in.(processing,queued),"
+            f"processing_status.is.null,"
+            f"last_checked_date.is.null,"
+            f"last_checked_date.lte.{zombie_before}"
+        ).execute()
+
+        if not claim.data:
+            status = case.get('processing_status')
+            return jsonify({
+                "success": False, 
+                "error": f"Case is already {status}! Please wait."
+            }), 429
+        _invalidate_progress_cache(case_id)
 
-        # Start background thread
-        import threading
-        thread = threading.Thread(target=run_case_background_update, args=(case_id,))
-        thread.start()
+        # Hand off to the shared pool — bounded workers, no thread spawn
+        # per click
+        RESEARCH_POOL.submit(run_case_background_update, case_id)
 
         return jsonify({"success": True, "message": "Research started in background"}), 202
 
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         return jsonify({"error": str(e)}), 500
     
 
 @app.route('/api/trigger_all', methods=['POST'])
-@login_required # <--- PROTECTED because it triggers heavy load
+@api_login_required # <--- PROTECTED because it triggers heavy load
 def trigger_all():
     """
     Manually trigger the scheduled case check for all eligible cases.
@@ -914,7 +1270,7 @@ def trigger_all():
 
 
 @app.route('/api/scheduler/status', methods=['GET'])
-@login_required # <--- PROTECTED
+@api_login_required # <--- PROTECTED
 def scheduler_status():
     """Get the scheduler status and next run time."""
     try:
@@ -939,7 +1295,7 @@ def scheduler_status():
         }), 500
         
 @app.route('/api/scheduler/run-now', methods=['POST'])
-@login_required
+@api_login_required
 def run_scheduler_now():
     """Manually trigger the scheduled job immediately."""
     try:
@@ -955,8 +1311,40 @@ def run_scheduler_now():
         }), 500
 
 
+def _batch_trigger(case_ids):
+    """
+    Run a one-time scheduled check for several cases as a SINGLE job.
+
+    One in_() fetch validates the ids, one PATCH marks them all queued
+    (the payload is identical, so no per-case round trips), then the
+    existing background updater runs per case in a pool sized to the
+    research semaphore.
+    """
+    try:
+        client = get_supabase_client()
+        rows = client.table("cases").select("id").in_("id", case_ids).execute().data
+        found_ids = [row['id'] for row in rows]
+        if not found_ids:
+            logger.warning("⏰ Batch check found none of the scheduled cases: %s", case_ids)
+            return
+
+        client.table("cases").update({
+            "processing_status": "queued",
+            "progress_percent": 0,
+            "progress_message": "Waiting in queue..."
+        }).in_("id", found_ids).execute()
+        _invalidate_read_cache()
+
+        list(RESEARCH_POOL.map(run_case_background_update, found_ids))
+
+        logger.info("⏰ Batch check complete for %d cases", len(found_ids))
+
+    except Exception as e:
+        logger.error("❌ Batch check error: %s", e)
+
+
 @app.route('/api/schedule_custom_check', methods=['POST'])
-@login_required
+@api_login_required
 def schedule_custom_check():
     """
     Schedules a one-time 'God Mode' check for specific cases at a specific time.
@@ -972,49 +1360,46 @@ def schedule_custom_check():
         # Parse the time string into a python datetime object
         run_date = datetime.fromisoformat(run_time_str)
 
-        # Schedule a job for EACH case selected
-        scheduled_count = 0
-        for cid in case_ids:
-            # We reuse the existing 'trigger_update' function because it ALREADY has email logic!
-            job_id = f"manual_{cid}_{int(datetime.now().timestamp())}"
-            
-            scheduler.add_job(
-                func=trigger_update, # The function to run
-                args=[cid],          # The argument (case_id)
-                trigger='date',      # Run once at a specific date
-                run_date=run_date,
-                id=job_id,
-                name=f"One-time check for Case {cid}"
-            )
-            scheduled_count += 1
-            print(f"⏰ Scheduled Check for Case {cid} at {run_date}")
+        # ONE job for the whole selection: at T0 the scheduler wakes a
+        # single callable instead of spawning a thread per case.
+        scheduler.add_job(
+            func=_batch_trigger,
+            args=[case_ids],
+            trigger='date',
+            run_date=run_date,
+            id=f"batch_{int(datetime.now().timestamp())}",
+            name=f"One-time check for {len(case_ids)} cases"
+        )
+        logger.info("⏰ Scheduled batch check for %d cases at %s", len(case_ids), run_date)
 
         return jsonify({
             "success": True, 
-            "message": f"Successfully scheduled {scheduled_count} cases for {run_time_str}"
+            "message": f"Successfully scheduled {len(case_ids)} cases for {run_time_str}"
         }), 200
 
     except Exception as e:
-        print(f"❌ Scheduling Error: {e}")
+        logger.error("❌ Scheduling Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/cases/upcoming-hearings', methods=['GET'])
-@login_required
+@api_login_required
 def upcoming_hearings():
     """
     Get cases with upcoming hearings.
     """
     try:
         days = request.args.get('days', 7, type=int)
-        cases = get_upcoming_hearings(days)
-        
-        return jsonify({
+        cases = _cached_read(("upcoming", days), lambda: get_upcoming_hearings(days))
+
+        response = jsonify({
             "success": True,
             "data": cases,
             "count": len(cases),
             "days_ahead": days
         })
+        response.headers['Cache-Control'] = 'max-age=30, stale-while-revalidate=60'
+        return response
     except Exception as e:
         return jsonify({
             "success": False,
@@ -1023,7 +1408,7 @@ def upcoming_hearings():
 
 
 @app.route('/api/init-db', methods=['POST'])
-@login_required # <--- RESTRICT THIS ONE CAREFULLY
+@api_login_required # <--- RESTRICT THIS ONE CAREFULLY
 def initialize_database():
     """
     Initialize the database (create tables if needed).
@@ -1065,10 +1450,243 @@ def server_error(error):
     }), 500
 
 
+@app.errorhandler(413)
+def payload_too_large(error):
+    return jsonify({
+        "success": False,
+        "error": "File too large (limit is 100 MB)"
+    }), 413
+
+
+# --- SMART COLUMN MAPPING ("Spelling Bee" Fix) ---
+# Acceptable header variations, keyed by canonical field name
+_IMPORT_COLUMN_MAP = {
+    'case_name': ['casename', 'case', 'name', 'title', 'subject'],
+    'victim_name': ['victimname', 'victim', 'plaintiff'],
+    'suspect_name': ['suspectname', 'suspect', 'defendant', 'accused'],
+    'docket_url': ['docketurl', 'docket', 'url', 'link']
+}
+
+# Both built once at import: a translate table normalizes a header in a
+# single C-side pass (lowercase + drop spaces/underscores), and the
+# inverted variation -> field dict turns matching into one hash lookup
+# per header instead of scanning every variation list.
+_COL_NORM_TBL = str.maketrans('', '', ' _')
+_IMPORT_COLUMN_LOOKUP = {
+    variation: target
+    for target, variations in _IMPORT_COLUMN_MAP.items()
+    for variation in variations
+}
+
+
+def _resolve_import_headers(raw_columns):
+    """
+    Map raw upload headers to canonical case fields.
+
+    Returns {raw_header: canonical_field} for the first header matching
+    each field, comparing on lower-cased headers with spaces and
+    underscores stripped.
+    """
+    resolved = {}
+    found_target_cols = set() # Track what we found
+
+    for raw in raw_columns:
+        target = _IMPORT_COLUMN_LOOKUP.get(str(raw).lower().translate(_COL_NORM_TBL))
+        if target and target not in found_target_cols:
+            resolved[raw] = target
+            found_target_cols.add(target)
+
+    return resolved
+
+
+def _prepare_import_rows(df, filename, resolved=None):
+    """
+    Map a raw upload DataFrame to insert-ready case dicts.
+
+    `resolved` lets chunked readers pass the header mapping computed on
+    the first chunk instead of re-matching identical headers per chunk.
+
+    Returns (rows, error): error is a message when no case-name column
+    could be recognized, otherwise None.
+    """
+    # An empty upload is user error, not a successful import of 0 cases
+    if df.empty:
+        return None, "File contains no rows"
+
+    if resolved is None:
+        resolved = _resolve_import_headers(df.columns)
+    df.rename(columns=resolved, inplace=True)
+    
+    # Check if 'case_name' exists after remapping
+    if 'case_name' not in df.columns:
+        return None, f"Could not find a 'Case Name' column. Found: {list(df.columns)}"
+
+    # Build the payload from zipped column arrays: reindex fills any
+    # missing name columns, and the comprehension only touches plain
+    # Python objects — no per-row pandas indexing. The constant fields
+    # are shared literals, so inlining them beats materializing three
+    # constant columns just to convert them back.
+    # last_checked_date is omitted on purpose: the column's DEFAULT
+    # NOW() fills it server-side, saving ~30 bytes of payload per row
+    notes = f"Imported from {filename}"
+
+    payload = df.reindex(columns=['case_name', 'victim_name', 'suspect_name'])
+
+    # na_value=None swaps NaN/pd.NA for None during the C-side array
+    # conversion (missing values aren't JSON), for both numpy- and
+    # arrow-backed columns
+    return [{
+        "case_name": case_name,
+        "victim_name": victim,
+        "suspect_name": suspect,
+        "status": "Open",
+        "notes": notes
+    } for case_name, victim, suspect in zip(
+        payload['case_name'].to_numpy(na_value=None),
+        payload['victim_name'].to_numpy(na_value=None),
+        payload['suspect_name'].to_numpy(na_value=None)
+    )], None
+
+
+# Import jobs run off the request thread: the handler saves the upload,
+# queues a job and answers 202 right away, so the client (and the
+# gunicorn worker) never waits out hundreds of insert round trips.
+_import_jobs = {}
+_import_queue = queue.Queue()
+
+
+_SMALL_CSV_BYTES = 1024 * 1024
+
+
+def _import_small_csv(path, filename):
+    """
+    Fast path for small CSVs: csv.DictReader straight into the bulk
+    insert, skipping pandas' frame construction, which dominates the
+    cost at this size.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        resolved = _resolve_import_headers(reader.fieldnames or [])
+        targets = {target: raw for raw, target in resolved.items()}
+        if 'case_name' not in targets:
+            raise ValueError(
+                f"Could not find a 'Case Name' column. Found: {reader.fieldnames}"
+            )
+
+        name_col = targets['case_name']
+        victim_col = targets.get('victim_name')
+        suspect_col = targets.get('suspect_name')
+        notes = f"Imported from {filename}"
+
+        rows = [{
+            "case_name": row[name_col],
+            "victim_name": row[victim_col] or None if victim_col else None,
+            "suspect_name": row[suspect_col] or None if suspect_col else None,
+            "status": "Open",
+            "notes": notes
+        } for row in reader]
+
+    if not rows:
+        raise ValueError("File contains no rows")
+
+    inserted, failures = create_cases_bulk(rows)
+    return inserted, failures
+
+
+def _run_import_job(path, filename):
+    """
+    Parse a saved upload and bulk-insert it.
+
+    Returns (imported, failures), where failures lists the row ranges
+    whose batch insert failed — partial progress survives a transient
+    error instead of forcing the whole file to be re-imported.
+    """
+    imported_count = 0
+    failures = []
+
+    if filename.endswith('.csv'):
+        if os.path.getsize(path) < _SMALL_CSV_BYTES:
+            return _import_small_csv(path, filename)
+
+        # Stream the CSV in chunks so a big upload never sits fully
+        # in memory — each parsed chunk is bulk-inserted while the
+        # next one parses. Peak memory is O(chunk), not O(file).
+        # Arrow-backed strings pack the text columns into contiguous
+        # buffers instead of one boxed str per cell — a multiple less
+        # RSS per chunk. Older pandas without the backend falls back.
+        try:
+            reader = pd.read_csv(path, chunksize=5000, dtype_backend='pyarrow')
+        except (TypeError, ImportError):
+            reader = pd.read_csv(path, chunksize=5000)
+
+        resolved = None
+        for chunk in reader:
+            if resolved is None:
+                resolved = _resolve_import_headers(chunk.columns)
+            rows, error = _prepare_import_rows(chunk, filename, resolved)
+            if error:
+                raise ValueError(error)
+            inserted, chunk_failures = create_cases_bulk(rows)
+            imported_count += inserted
+            failures.extend(chunk_failures)
+        if resolved is None:
+            # header-only file: the reader yielded no chunks at all
+            raise ValueError("File contains no rows")
+    else:
+        # openpyxl can't stream; Excel stays on the in-memory path.
+        # calamine parses the sheet with a streaming Rust reader instead
+        # of openpyxl's full XML DOM — several times faster and far less
+        # peak memory on big workbooks.
+        try:
+            df = pd.read_excel(path, engine='calamine', dtype_backend='pyarrow')
+        except Exception:
+            df = pd.read_excel(path)
+        rows, error = _prepare_import_rows(df, filename)
+        if error:
+            raise ValueError(error)
+        imported_count, failures = create_cases_bulk(rows)
+
+    return imported_count, failures
+
+
+def _import_worker():
+    while True:
+        job_id, path, filename = _import_queue.get()
+        job = _import_jobs[job_id]
+        job["status"] = "processing"
+        try:
+            imported, failures = _run_import_job(path, filename)
+            job["imported"] = imported
+            job["failed"] = failures[:100]
+            if failures and not imported:
+                job["status"] = "error"
+                job["error"] = "All insert batches failed"
+            elif failures:
+                job["status"] = "partial"
+            else:
+                job["status"] = "complete"
+            _invalidate_read_cache()
+            logger.info("✅ Import %s %s: %d cases, %d failed batches",
+                        job_id, job["status"], imported, len(failures))
+        except Exception as e:
+            job["status"] = "error"
+            job["error"] = str(e)
+            logger.error("❌ Import %s failed: %s", job_id, e)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            _import_queue.task_done()
+
+
+threading.Thread(target=_import_worker, daemon=True, name="import-worker").start()
+
+
 @app.route('/api/import_cases', methods=['POST'])
-@login_required
+@api_login_required
 def import_cases():
-    """Import cases from an Excel or CSV file."""
+    """Import cases from an Excel or CSV file (processed in the background)."""
     if 'file' not in request.files:
         return jsonify({"error": "No file part"}), 400
     
@@ -1076,66 +1694,37 @@ def import_cases():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
+    if not file.filename.endswith(('.csv', '.xls', '.xlsx')):
+        return jsonify({"error": "Invalid file type. Please upload .csv or .xlsx"}), 400
+
     try:
-        # Read the file into a DataFrame
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file)
-        elif file.filename.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(file)
-        else:
-            return jsonify({"error": "Invalid file type. Please upload .csv or .xlsx"}), 400
-
-        # --- SMART COLUMN MAPPING ("Spelling Bee" Fix) ---
-        # 1. Normalize all existing columns to lower case stripped
-        df.columns = [str(c).lower().strip().replace(' ', '').replace('_', '') for c in df.columns]
-
-        # 2. Define acceptable variations
-        column_map = {
-            'case_name': ['casename', 'case', 'name', 'title', 'subject'],
-            'victim_name': ['victimname', 'victim', 'plaintiff'],
-            'suspect_name': ['suspectname', 'suspect', 'defendant', 'accused'],
-            'docket_url': ['docketurl', 'docket', 'url', 'link']
-        }
+        # Persist the upload so the worker can read it after this
+        # request (and its file stream) is gone
+        suffix = os.path.splitext(file.filename)[1]
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'wb') as tmp:
+            file.save(tmp)
 
-        # 3. Rename columns based on map
-        new_columns = {}
-        found_target_cols = set() # Track what we found
-
-        for target_col, variations in column_map.items():
-            for col in df.columns:
-                # If we haven't found this target yet AND this column matches
-                if target_col not in found_target_cols and col in variations:
-                    new_columns[col] = target_col
-                    found_target_cols.add(target_col) 
-                    break # Stop looking for this target column!
-        
-        df.rename(columns=new_columns, inplace=True)
-        
-        # Check if 'case_name' exists after remapping
-        if 'case_name' not in df.columns:
-            return jsonify({"error": f"Could not find a 'Case Name' column. Found: {list(df.columns)}"}), 400
-
-        # Loop through rows and add to Supabase
-        imported_count = 0
-        for _, row in df.iterrows():
-            case_data = {
-                "case_name": row['case_name'],
-                "victim_name": row.get('victim_name', None),
-                "suspect_name": row.get('suspect_name', None),
-                "status": "Open",  # Default status
-                "notes": f"Imported from {file.filename}",
-                "last_checked_date": datetime.utcnow().isoformat()
-            }
-            # Insert into DB using our helper
-            create_case(case_data)
-            imported_count += 1
+        job_id = uuid.uuid4().hex
+        _import_jobs[job_id] = {"status": "queued", "imported": 0, "failed": [], "error": None}
+        _import_queue.put_nowait((job_id, path, file.filename))
 
-        return jsonify({"message": f"Successfully imported {imported_count} cases!"}), 200
+        return jsonify({"job_id": job_id, "status": "queued"}), 202
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/import/status/<job_id>', methods=['GET'])
+@api_login_required
+def import_status(job_id):
+    """Poll the state of a queued import job."""
+    job = _import_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify({"job_id": job_id, **job}), 200
+
+
 # ==================== Main Entry Point ====================
 
 if __name__ == '__main__':
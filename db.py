@@ -1,35 +1,60 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+try:
+    from supabase.lib.client_options import ClientOptions
+except ImportError:  # import path moved across supabase-py releases
+    ClientOptions = None
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 supabase: Client = None
+_client_lock = threading.Lock()
 
 
 def get_supabase_client() -> Client:
     """
     Get or create the Supabase client instance.
-    
+
+    The client (and its keep-alive HTTP session) is built once per process
+    and shared — supabase-py's underlying httpx client is thread-safe, so
+    concurrent request handlers and scheduler threads can reuse it. The
+    lock only guards first construction so racing threads don't each pay
+    for (and leak) a client.
+
     Returns:
         Client: The Supabase client instance.
-    
+
     Raises:
         ValueError: If SUPABASE_URL or SUPABASE_KEY environment variables are not set.
     """
     global supabase
-    
+
     if supabase is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_KEY environment variables must be set. "
-                "Please check your .env file."
-            )
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    
+        with _client_lock:
+            if supabase is None:
+                if not SUPABASE_URL or not SUPABASE_KEY:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_KEY environment variables must be set. "
+                        "Please check your .env file."
+                    )
+                # Explicit timeouts: without them a hung PostgREST call
+                # can pin a worker thread indefinitely. The client's
+                # keep-alive pool is shared process-wide either way.
+                if ClientOptions is not None:
+                    supabase = create_client(
+                        SUPABASE_URL, SUPABASE_KEY,
+                        options=ClientOptions(postgrest_client_timeout=10)
+                    )
+                else:
+                    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
     return supabase
 
 
@@ -58,6 +83,9 @@ def init_db() -> bool:
         client = get_supabase_client()
         
         try:
+            # This probe doubles as a connection warm-up: it pays the
+            # TLS/TCP handshake at startup so the first real request
+            # (or import batch) reuses an established keep-alive socket.
             response = client.table("cases").select("id").limit(1).execute()
             print("✓ 'cases' table already exists.")
             return True
@@ -70,6 +98,8 @@ def init_db() -> bool:
                 id SERIAL PRIMARY KEY,
                 case_name TEXT NOT NULL,
                 docket_url TEXT,
+                docket_etag TEXT,
+                docket_last_modified TEXT,
                 victim_name TEXT,
                 suspect_name TEXT,
                 next_hearing_date DATE,
@@ -90,6 +120,18 @@ def init_db() -> bool:
             
             -- Create an index on next_hearing_date for scheduling queries
             CREATE INDEX IF NOT EXISTS idx_cases_next_hearing ON cases(next_hearing_date);
+            
+            -- Unique case names let bulk imports dedupe in the database
+            -- via INSERT ... ON CONFLICT DO NOTHING
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_cases_case_name ON cases(case_name);
+            
+            -- The trigger path claims cases with a filter on
+            -- processing_status + last_checked_date (zombie unlock), and
+            -- the daily sweep filters on staleness; both stay index scans
+            -- as the table grows. Low cardinality, but the composite
+            -- makes the stale-row probe cheap.
+            CREATE INDEX IF NOT EXISTS idx_cases_proc_status ON cases(processing_status);
+            CREATE INDEX IF NOT EXISTS idx_cases_proc_checked ON cases(processing_status, last_checked_date);
             """
             
             try:
@@ -115,30 +157,35 @@ def init_db() -> bool:
         return False
 
 
-def get_all_cases():
+def get_all_cases(cols: str = "*"):
     """
     Retrieve all cases from the database.
     
+    Args:
+        cols: Column projection — callers that only need a few fields
+            can pass them to keep wide TEXT columns off the wire.
+    
     Returns:
         list: List of case records.
     """
     client = get_supabase_client()
-    response = client.table("cases").select("*").execute()
+    response = client.table("cases").select(cols).execute()
     return response.data
 
 
-def get_case_by_id(case_id: int):
+def get_case_by_id(case_id: int, cols: str = "*"):
     """
     Retrieve a specific case by its ID.
     
     Args:
         case_id: The ID of the case to retrieve.
+        cols: Column projection (defaults to all columns).
     
     Returns:
         dict: The case record, or None if not found.
     """
     client = get_supabase_client()
-    response = client.table("cases").select("*").eq("id", case_id).execute()
+    response = client.table("cases").select(cols).eq("id", case_id).execute()
     return response.data[0] if response.data else None
 
 
@@ -164,6 +211,68 @@ def create_case(case_data: dict):
     return response.data[0] if response.data else None
 
 
+def create_cases_bulk(rows: list, chunk_size: int = 500):
+    """
+    Insert many cases in chunked batches.
+
+    One insert per chunk replaces a round trip per row, and one
+    in_() lookup per chunk replaces create_case()'s per-row duplicate
+    check — existing case names are skipped the same way. A failed
+    chunk is logged and skipped so it doesn't sink the whole import.
+
+    Args:
+        rows: List of case dicts to insert.
+        chunk_size: Rows per insert request.
+
+    Returns:
+        tuple: (inserted, failures) — cases actually inserted, and a
+        list of {'rows': 'start-end', 'error': ...} dicts for chunks
+        whose insert failed. Failed chunks don't abort the rest.
+    """
+    client = get_supabase_client()
+    failures = []
+
+    def insert_chunk(start):
+        chunk = rows[start:start + chunk_size]
+        try:
+            # One round trip: the unique index on case_name lets the
+            # database drop duplicates with ON CONFLICT DO NOTHING, so
+            # no SELECT is needed first. Only inserted rows come back.
+            response = client.table("cases").upsert(
+                chunk, on_conflict="case_name", ignore_duplicates=True
+            ).execute()
+            inserted = len(response.data) if response.data else 0
+            skipped = len(chunk) - inserted
+            if skipped:
+                print(f"⚠️ Skipping {skipped} duplicate case(s) in batch.")
+            return inserted
+        except Exception:
+            # Deployments predating the unique index can't use
+            # ON CONFLICT — fall back to SELECT-then-INSERT dedupe
+            try:
+                names = [r["case_name"] for r in chunk]
+                existing = client.table("cases").select("case_name").in_("case_name", names).execute()
+                taken = {r["case_name"] for r in existing.data}
+                new_rows = [r for r in chunk if r["case_name"] not in taken]
+                if not new_rows:
+                    return 0
+                response = client.table("cases").insert(new_rows).execute()
+                return len(response.data) if response.data else len(new_rows)
+            except Exception as e:
+                print(f"⚠️ Bulk insert failed for rows {start}-{start + len(chunk) - 1}: {e}")
+                failures.append({"rows": f"{start}-{start + len(chunk) - 1}", "error": str(e)})
+                return 0
+
+    starts = range(0, len(rows), chunk_size)
+    if len(starts) <= 1:
+        return (insert_chunk(0), failures) if rows else (0, failures)
+
+    # Chunks are independent inserts, so overlap their round trips.
+    # Concurrency past ~4 mostly queues on the server side.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return sum(pool.map(insert_chunk, starts)), failures
+
+
 def update_case(case_id: int, case_data: dict):
     """
     Update an existing case.
@@ -195,18 +304,59 @@ def delete_case(case_id: int):
     return True
 
 
-def get_cases_by_status(status: str):
+def get_cases_by_status(status: str, cols: str = "*"):
     """
     Retrieve cases filtered by status.
     
     Args:
         status: The status to filter by ('Open', 'Closed', 'Verdict Reached').
+        cols: Column projection (defaults to all columns).
     
     Returns:
         list: List of case records matching the status.
     """
     client = get_supabase_client()
-    response = client.table("cases").select("*").eq("status", status).execute()
+    response = client.table("cases").select(cols).eq("status", status).execute()
+    return response.data
+
+
+def get_due_cases(days_soon: int = 7, days_window: int = 30, stale_days: int = 3):
+    """
+    Retrieve Open/Pending cases that are due for a research run.
+
+    The eligibility rules live in one PostgREST filter so only due rows
+    cross the wire, instead of fetching every open case and deciding in
+    Python. A case is due when it has no hearing date, the hearing is
+    overdue or within `days_soon` days, or the hearing is within
+    `days_window` days and the case hasn't been checked for
+    `stale_days` days.
+
+    Args:
+        days_soon: Horizon inside which cases always run.
+        days_window: Outer horizon, checked only when stale.
+        stale_days: Age of last_checked_date that counts as stale.
+
+    Returns:
+        list: List of due case records.
+    """
+    from datetime import datetime, timedelta, timezone
+
+    client = get_supabase_client()
+    today = datetime.now().date()
+    soon = (today + timedelta(days=days_soon)).isoformat()
+    window = (today + timedelta(days=days_window)).isoformat()
+    stale_before = (datetime.now(timezone.utc) - timedelta(days=stale_days)).isoformat()
+
+    response = client.table("cases").select("*")\
+        .in_("status", ["Open", "Pending"])\
+        .or_(
+            f"next_hearing_date.is.null,"
+            f"next_hearing_date.lte.{soon},"
+            f"and(next_hearing_date.lte.{window},"
+            f"or(last_checked_date.is.null,last_checked_date.lte.{stale_before}))"
+        )\
+        .execute()
+
     return response.data
 
 
@@ -223,8 +373,9 @@ def get_upcoming_hearings(days: int = 7):
     from datetime import datetime, timedelta
     
     client = get_supabase_client()
-    today = datetime.now().date().isoformat()
-    future_date = (datetime.now() + timedelta(days=days)).date().isoformat()
+    now = datetime.now()
+    today = now.date().isoformat()
+    future_date = (now + timedelta(days=days)).date().isoformat()
     
     response = client.table("cases").select("*")\
         .gte("next_hearing_date", today)\
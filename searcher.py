@@ -1,9 +1,257 @@
 import asyncio
+import atexit
+import io
+import threading
+from urllib.parse import urlsplit
+import httpx
+from bs4 import BeautifulSoup
 from crawl4ai import AsyncWebCrawler
+from diskcache import Cache
+from pypdf import PdfReader
 
-async def run_crawler(url):
+# Prefer uvloop for the crawler's loop when available — the whole
+# scrape workload is socket readiness churn, which is exactly where a
+# libuv loop beats the stdlib selector. agent.py sets the same policy,
+# but searcher must not depend on its import order.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Court pages change rarely, so a day-bounded scrape cache turns repeat
+# visits to the same URL (docket re-checks, retry passes, duplicate
+# cases) into a disk read instead of a browser fetch. The full markdown
+# is cached and truncation applied per call, so one entry serves every
+# max_chars a caller asks for.
+_SCRAPE_CACHE = Cache("./.scrape_cache")
+_SCRAPE_CACHE_TTL = 86400  # 24 hours
+
+# Shared HTTP client for the non-browser fetch paths (static pages,
+# PDFs): the keep-alive pool reuses TCP+TLS to repeatedly-hit origins,
+# and per-host limits stop a burst from hammering one court site. Only
+# ever used from coroutines on the crawler loop.
+_HTTP_CLIENT = httpx.AsyncClient(
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=20)
+)
+
+
+def clear_scrape_cache(url):
+    """Drop the cached markdown for a URL (user-requested refresh)."""
+    _SCRAPE_CACHE.delete(("scrape", url))
+
+# One Chromium for the whole process: the browser lives on a dedicated
+# event loop in a background thread and every scrape is submitted to it
+# with run_coroutine_threadsafe. Launching Playwright costs 1-2s, so
+# paying it once at first use instead of per call (or per wave) is the
+# single biggest latency win on the scrape path.
+_CRAWLER = None
+_CRAWLER_LOOP = None
+_crawler_lock = threading.Lock()
+
+
+def _get_crawler():
+    """Lazily start the background loop and open the shared browser."""
+    global _CRAWLER, _CRAWLER_LOOP
+    if _CRAWLER_LOOP is None:
+        with _crawler_lock:
+            if _CRAWLER_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, daemon=True, name='crawler-loop'
+                ).start()
+                crawler = AsyncWebCrawler(verbose=True)
+                asyncio.run_coroutine_threadsafe(crawler.__aenter__(), loop).result(timeout=120)
+                _CRAWLER = crawler
+                _CRAWLER_LOOP = loop
+    return _CRAWLER_LOOP, _CRAWLER
+
+
+def _close_crawler():
+    """Best-effort browser shutdown so exits don't orphan Chromium."""
+    if _CRAWLER_LOOP is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(
+                _HTTP_CLIENT.aclose(), _CRAWLER_LOOP
+            ).result(timeout=5)
+        except Exception:
+            pass
+        try:
+            asyncio.run_coroutine_threadsafe(
+                _CRAWLER.__aexit__(None, None, None), _CRAWLER_LOOP
+            ).result(timeout=10)
+        except Exception:
+            pass
+
+
+atexit.register(_close_crawler)
+
+
+# Domains learned at runtime to serve JS-rendered shells: the static
+# fast path skips them outright instead of paying a wasted GET before
+# every browser navigation.
+_NEEDS_BROWSER = set()
+
+
+async def _fetch_static(url):
+    """
+    Plain GET + lxml text extraction for server-rendered pages.
+
+    Most search hits (news articles, court RSS pages, wikis) don't need
+    a JS engine — one HTTP GET is 50-100x cheaper than a Chromium
+    navigation. Returns None when the page looks JS-rendered (or the
+    domain is already known to be), letting the caller fall through to
+    the browser; the domain is remembered so the probe isn't repeated.
+    """
+    host = urlsplit(url).netloc
+    if host in _NEEDS_BROWSER:
+        return None
+
+    try:
+        response = await _HTTP_CLIENT.get(url, timeout=5)
+        if not response.is_success or 'html' not in response.headers.get('content-type', ''):
+            return None
+        html = response.text
+        if len(html) < 512:
+            _NEEDS_BROWSER.add(host)
+            return None
+
+        soup = BeautifulSoup(html, 'lxml')
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+        text = soup.get_text('\n', strip=True)
+
+        # A big document with hardly any text is a JS shell — let the
+        # browser render it, and don't probe this domain again
+        if len(text) < 500:
+            _NEEDS_BROWSER.add(host)
+            return None
+        return text
+    except Exception as e:
+        print(f"⚠️ Static fetch failed for {url}: {e} — trying the browser")
+        return None
+
+
+async def _fetch_pdf(url):
+    """
+    Download a PDF with a plain GET and extract its text with pypdf.
+    Launching a rendering browser for a file format with no JS and no
+    layout to execute is orders of magnitude more work than this.
+    """
+    response = await _HTTP_CLIENT.get(url, timeout=30)
+    response.raise_for_status()
+    reader = PdfReader(io.BytesIO(response.content))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+# In-flight fetch coalescing: when two concurrent cases want the same
+# URL (shared dockets, batch listings), the second awaits the first's
+# future instead of fetching again. A plain dict is race-free here
+# because every scrape coroutine runs on the single crawler loop.
+_INFLIGHT = {}
+
+
+async def _fetch_full(crawler, url, force_refresh):
+    """Produce the full (untruncated) markdown for a URL."""
+    cache_key = ("scrape", url)
+    if not force_refresh:
+        cached = _SCRAPE_CACHE.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Scrape cache hit: {url}")
+            return cached
+
+    markdown = None
+    if url.lower().endswith('.pdf'):
+        try:
+            markdown = await _fetch_pdf(url)
+        except Exception as e:
+            # Scanned/malformed PDFs (or auth walls) fall through to the
+            # browser, which sometimes copes where pypdf can't
+            print(f"⚠️ Direct PDF fetch failed for {url}: {e} — trying the browser")
+    else:
+        markdown = await _fetch_static(url)
+        if markdown:
+            print(f"⚡ Static fast path served {url}")
+
+    if not markdown:
+        result = await crawler.arun(
+            url=url,
+            bypass_cache=True,
+            magic=True,  # This often helps with simple PDFs
+            word_count_threshold=10
+        )
+        markdown = result.markdown
+
+    if markdown:
+        # Only successful fetches are worth remembering — an empty
+        # result should be retried on the next call, not served back
+        _SCRAPE_CACHE.set(cache_key, markdown, expire=_SCRAPE_CACHE_TTL)
+    return markdown
+
+
+async def _scrape_one(crawler, url, max_chars, force_refresh=False):
+    """Fetch one URL on the crawler loop and truncate at the source."""
+    future = _INFLIGHT.get(url)
+    if future is not None:
+        print(f"♻️ Coalescing with in-flight fetch: {url}")
+        markdown = await future
+    else:
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[url] = future
+        try:
+            markdown = await _fetch_full(crawler, url, force_refresh)
+            future.set_result(markdown)
+        except asyncio.CancelledError:
+            # CancelledError is a BaseException, so the clause below never
+            # sees it — and the agent cancels scrapes routinely (losing
+            # speculative branches). Cancel the shared future too, or
+            # every coalesced waiter blocks on it forever.
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved even with no waiters
+            raise
+        finally:
+            _INFLIGHT.pop(url, None)
+
+    if max_chars and markdown and len(markdown) > max_chars:
+        markdown = markdown[:max_chars]
+    return markdown
+
+
+async def _scrape_many(crawler, urls, max_concurrency, max_chars, force_refresh=False):
+    """Fetch a wave of URLs concurrently on the crawler loop."""
+    # Duplicate URLs within a wave collapse to one fetch; the results
+    # dict answers for every occurrence either way
+    urls = list(dict.fromkeys(urls))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(url):
+        async with semaphore:
+            return await _scrape_one(crawler, url, max_chars, force_refresh=force_refresh)
+
+    gathered = await asyncio.gather(
+        *(bounded(url) for url in urls),
+        return_exceptions=True
+    )
+
+    results = {}
+    for url, result in zip(urls, gathered):
+        if isinstance(result, Exception):
+            print(f"⚠️ Error scraping {url}: {result}")
+            results[url] = None
+        else:
+            results[url] = result
+    return results
+
+
+async def run_crawler(url, max_chars=None, force_refresh=False):
     """
-    The asynchronous core that launches the browser (Playwright) via Crawl4AI.
+    Scrape one URL through the shared browser.
+    max_chars truncates the markdown at the source, so megabyte pages never
+    travel back to the caller just to be sliced there.
     """
     # ✅ STRATEGY 1: If it's a PDF, try to handle it (Simple version)
     if url.lower().endswith('.pdf'):
@@ -12,59 +260,70 @@ async def run_crawler(url):
         # If Crawl4AI fails, we will catch it in the try/except block below.
         pass 
 
-    async with AsyncWebCrawler(verbose=True) as crawler:
-        try:
-            result = await crawler.arun(
-                url=url,
-                bypass_cache=True,
-                magic=True,  # This often helps with simple PDFs
-                word_count_threshold=10
+    try:
+        # First call blocks briefly while the browser launches; after
+        # that this is a hop onto an already-warm loop.
+        loop, crawler = _get_crawler()
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(
+                _scrape_one(crawler, url, max_chars, force_refresh=force_refresh), loop
             )
-            return result.markdown
-        except Exception as e:
-            print(f"⚠️ Failed to scrape {url}: {e}")
-            return ""  # Return empty only if it actually fails
+        )
+    except Exception as e:
+        print(f"⚠️ Failed to scrape {url}: {e}")
+        return ""  # Return empty only if it actually fails
 
 
-async def run_crawler_batch(urls):
+async def run_crawler_batch(urls, max_chars=None, concurrency=6, force_refresh=False):
     """
     Run the crawler for multiple URLs in a single browser session.
+    The old version kept the browser open but still fetched one URL at
+    a time; now the whole batch is gathered concurrently, so the wave
+    takes as long as its slowest URL instead of the sum of them all.
     """
-    results = {}
-    async with AsyncWebCrawler(verbose=True) as crawler:
-        # We can't actually "batch" parallel in one call easily with this lib 
-        # unless we use gather, but reusing the crawler instance context manager 
-        # keeps the browser open!
-        for url in urls:
-            try:
-                result = await crawler.arun(
-                    url=url,
-                    bypass_cache=True,
-                    magic=True,
-                    word_count_threshold=10
-                )
-                results[url] = result.markdown
-            except Exception as e:
-                print(f"⚠️ Error scraping {url}: {e}")
-                results[url] = None
-    return results
+    return await run_crawler_parallel(urls, max_concurrency=concurrency, max_chars=max_chars, force_refresh=force_refresh)
+
+async def run_crawler_parallel(urls, max_concurrency=5, max_chars=None, force_refresh=False):
+    """
+    Scrape multiple URLs concurrently through the shared browser.
+    The whole wave runs inside the one warm Chromium, so no URL pays
+    a cold start; the semaphore bounds how many pages are in flight
+    at once.
+    """
+    try:
+        loop, crawler = _get_crawler()
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(
+                _scrape_many(crawler, urls, max_concurrency, max_chars, force_refresh=force_refresh), loop
+            )
+        )
+    except Exception as e:
+        print(f"⚠️ Parallel scrape failed: {e}")
+        return {url: None for url in urls}
+
 
-def scrape_with_god_mode(url):
+def scrape_with_god_mode(url, max_chars=None):
     """
     Legacy single URL scraper.
     """
     try:
-        return asyncio.run(run_crawler(url))
+        loop, crawler = _get_crawler()
+        return asyncio.run_coroutine_threadsafe(
+            _scrape_one(crawler, url, max_chars), loop
+        ).result(timeout=300)
     except Exception as e:
         print(f"❌ Searcher Crash: {e}")
         return None
 
-def scrape_multiple_with_god_mode(urls):
+def scrape_multiple_with_god_mode(urls, max_chars=None):
     """
     Batch scraper wrapper.
     """
     try:
-        return asyncio.run(run_crawler_batch(urls))
+        loop, crawler = _get_crawler()
+        return asyncio.run_coroutine_threadsafe(
+            _scrape_many(crawler, urls, 6, max_chars), loop
+        ).result(timeout=600)
     except Exception as e:
         print(f"❌ Searcher Batch Crash: {e}")
         return {}
@@ -1,18 +1,73 @@
 import os
+import threading
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from typing import List
+from cachetools import TTLCache
 from langchain.tools import tool
 from dotenv import load_dotenv
-from searcher import scrape_with_god_mode
+from searcher import scrape_multiple_with_god_mode
 
 load_dotenv()
 
+# Search results for a given query barely move within the hour, and the
+# agent frequently re-issues the same query across turns (retry passes,
+# speculative searches). Serving repeats from memory skips the API
+# round trip and spares the Tavily/Serper quota.
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=3600)
+# TTLCache mutation isn't thread-safe, and searches arrive from many
+# executor threads at once
+_search_cache_lock = threading.Lock()
+
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 TAVILY_URL = "https://api.tavily.com/search"
 
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 SERPER_URL = "https://google.serper.dev/search"
 
+# Binary formats the browser can only download, not read. PDFs are NOT
+# listed — searcher extracts those directly with pypdf.
+_UNSCRAPABLE_EXT = (
+    '.zip', '.rar', '.png', '.jpg', '.jpeg', '.gif', '.svg',
+    '.mp3', '.mp4', '.avi', '.mov', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'
+)
+
+
+def _filter_scrape_urls(urls: List[str]) -> List[str]:
+    """
+    Drop URLs that are guaranteed to waste a fetch before fanning out:
+    non-http schemes, binary file extensions, and duplicates (fragments
+    stripped first so a.com/x and a.com/x#foo collapse).
+    """
+    cleaned = []
+    seen = set()
+    for url in urls:
+        if not url or not url.startswith(('http://', 'https://')):
+            continue
+        url = url.split('#', 1)[0]
+        if url.lower().endswith(_UNSCRAPABLE_EXT) or url in seen:
+            continue
+        seen.add(url)
+        cleaned.append(url)
+    return cleaned
+
+# One keep-alive session for every search API call: urllib3's pool
+# keeps the HTTPS socket warm, so repeat queries skip the TCP+TLS
+# handshake that otherwise dominates these short requests. Transient
+# provider hiccups retry with a small backoff — POST must be opted in,
+# since urllib3 excludes it from retries by default, and both search
+# providers take their (idempotent) queries via POST.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"POST"}))
+))
+_SERPER_HEADERS = {"X-API-KEY": SERPER_API_KEY or "", "Content-Type": "application/json"}
+
 
 def _tavily_request(query: str, num: int = 10) -> list:
     """Call Tavily Search API. Returns normalized list of {title, url, content}."""
@@ -26,9 +81,10 @@ def _tavily_request(query: str, num: int = 10) -> list:
         "include_answer": False,
         "include_raw_content": False,
     }
-    response = requests.post(TAVILY_URL, json=payload, timeout=30)
+    response = _session.post(TAVILY_URL, json=payload, timeout=30)
     response.raise_for_status()
-    raw = response.json().get("results", [])
+    # orjson straight off the raw bytes — skips requests' text decode
+    raw = orjson.loads(response.content).get("results", [])
     return [
         {
             "title": r.get("title", "No title"),
@@ -43,11 +99,10 @@ def _serper_request(query: str, num: int = 10) -> list:
     """Call Serper API. Returns normalized list of {title, url, content}."""
     if not SERPER_API_KEY:
         return []
-    headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
     payload = {"q": query, "num": min(num, 20)}
-    response = requests.post(SERPER_URL, headers=headers, json=payload, timeout=30)
+    response = _session.post(SERPER_URL, headers=_SERPER_HEADERS, json=payload, timeout=30)
     response.raise_for_status()
-    raw = response.json().get("organic", [])
+    raw = orjson.loads(response.content).get("organic", [])
     return [
         {
             "title": r.get("title", "No title"),
@@ -61,12 +116,24 @@ def _serper_request(query: str, num: int = 10) -> list:
 def _hybrid_search(query: str, num: int = 10) -> list:
     """
     Hybrid search: Tavily first, Serper fallback if Tavily errors or returns empty.
-    Returns normalized result list.
+    Returns normalized result list. Results are served from a 1-hour
+    in-memory cache on repeat queries.
     """
+    # Normalize the key so trivially different spellings of the same
+    # query ("Foo  v. Bar" vs "foo v. bar") share one cache entry
+    cache_key = (" ".join(query.lower().split()), num)
+    with _search_cache_lock:
+        cached = _SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        print(f"[Search] ⚡ Cache hit for '{query}'")
+        return cached
+
     try:
         results = _tavily_request(query, num=num)
         if results:
             print(f"[Search] Tavily returned {len(results)} results")
+            with _search_cache_lock:
+                _SEARCH_CACHE[cache_key] = results
             return results
         print("[Search] Tavily returned no results, falling back to Serper...")
     except Exception as e:
@@ -76,6 +143,10 @@ def _hybrid_search(query: str, num: int = 10) -> list:
         results = _serper_request(query, num=num)
         if results:
             print(f"[Search] Serper (fallback) returned {len(results)} results")
+            # Only non-empty result sets are cached, so a transient
+            # miss stays retryable
+            with _search_cache_lock:
+                _SEARCH_CACHE[cache_key] = results
         return results
     except Exception as e:
         print(f"[Search] Serper fallback also failed: {e}")
@@ -131,18 +202,25 @@ def scrape_content(urls: List[str]) -> str:
     if not urls:
         return "Error: No URLs provided for scraping."
 
-    results = []
+    urls = _filter_scrape_urls(urls)
+    if not urls:
+        return "Error: No scrapable URLs provided (http/https pages only)."
+
+    # One concurrent wave through the shared browser: N URLs cost
+    # roughly the slowest fetch instead of the sum of them all
+    batch = scrape_multiple_with_god_mode(urls)
 
+    results = []
     for url in urls:
-        try:
-            content = scrape_with_god_mode(url)
+        content = batch.get(url)
+        if content is None:
+            results.append(f"## Content from: {url}\n\nError: Failed to scrape\n")
+            continue
 
-            if len(content) > 5000:
-                content = content[:5000] + "\n\n[...content truncated at 5000 characters...]"
+        if len(content) > 5000:
+            content = content[:5000] + "\n\n[...content truncated at 5000 characters...]"
 
-            results.append(f"## Content from: {url}\n\n{content}\n")
-        except Exception as e:
-            results.append(f"## Content from: {url}\n\nError: Failed to scrape - {str(e)}\n")
+        results.append(f"## Content from: {url}\n\n{content}\n")
 
     return "\n---\n\n".join(results)
 